@@ -1,75 +1,103 @@
+import hmac
 import os
 from typing import Optional
 
-from fastapi import Depends, HTTPException, Request
+from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class PasswordAuthMiddleware(BaseHTTPMiddleware):
+class PasswordAuthMiddleware:
     """
     Middleware to check password authentication for all API requests.
     Only active when OPEN_NOTEBOOK_PASSWORD environment variable is set.
+
+    Implemented as a pure ASGI middleware (rather than BaseHTTPMiddleware) so
+    requests pass straight through without an extra task or Request object.
     """
 
-    def __init__(self, app, excluded_paths: Optional[list] = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, excluded_paths: Optional[list] = None):
+        self.app = app
         self.password = os.environ.get("OPEN_NOTEBOOK_PASSWORD")
-        self.excluded_paths = excluded_paths or [
+        # Compared against the raw header bytes, so encode once up front
+        self._expected = (self.password or "").encode()
+        excluded_paths = excluded_paths or [
             "/",
             "/health",
             "/docs",
             "/openapi.json",
             "/redoc",
         ]
+        # Entries ending in "*" are prefix matches, everything else is exact
+        self.excluded_paths = frozenset(
+            p for p in excluded_paths if not p.endswith("*")
+        )
+        self.excluded_prefixes = tuple(
+            p.rstrip("*") for p in excluded_paths if p.endswith("*")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Only HTTP requests are authenticated (lifespan/websocket pass through)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Skip authentication if no password is set
         if not self.password:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Skip authentication for excluded paths
-        if request.url.path in self.excluded_paths:
-            return await call_next(request)
+        path = scope["path"]
+        if path in self.excluded_paths or path.startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
 
         # Skip authentication for CORS preflight requests (OPTIONS)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
 
-        # Check authorization header
-        auth_header = request.headers.get("Authorization")
+        # Check authorization header (raw bytes, no decoding)
+        auth_header = None
+        for key, value in scope["headers"]:
+            if key == b"authorization":
+                auth_header = value
+                break
 
         if not auth_header:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Missing authorization header"},
                 headers={"WWW-Authenticate": "Bearer"},
             )
+            await response(scope, receive, send)
+            return
 
         # Expected format: "Bearer {password}"
-        try:
-            scheme, credentials = auth_header.split(" ", 1)
-            if scheme.lower() != "bearer":
-                raise ValueError("Invalid authentication scheme")
-        except ValueError:
-            return JSONResponse(
+        scheme, separator, credentials = auth_header.partition(b" ")
+        if not separator or scheme.lower() != b"bearer":
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Invalid authorization header format"},
                 headers={"WWW-Authenticate": "Bearer"},
             )
+            await response(scope, receive, send)
+            return
 
-        # Check password
-        if credentials != self.password:
-            return JSONResponse(
+        # Check password (constant-time)
+        if not hmac.compare_digest(credentials, self._expected):
+            response = JSONResponse(
                 status_code=401,
                 content={"detail": "Invalid password"},
                 headers={"WWW-Authenticate": "Bearer"},
             )
+            await response(scope, receive, send)
+            return
 
         # Password is correct, proceed with the request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
 # Optional: HTTPBearer security scheme for OpenAPI documentation
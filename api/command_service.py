@@ -1,8 +1,48 @@
-from typing import Any, Dict, List, Optional
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from surreal_commands import get_command_status, submit_command
 
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.exceptions import InvalidInputError
+
+# Keyset pagination over the surreal-commands queue table: (created, id)
+# descending, so each page seeks past the previous one instead of offsetting
+LIST_COMMAND_JOBS_QUERY = """
+    SELECT id, app, name, status, error_message, progress, created, updated
+    FROM command
+    WHERE ($app = NONE OR app = $app)
+    AND ($name = NONE OR name = $name)
+    AND ($status = NONE OR status = $status)
+    AND (
+        $cursor_created = NONE
+        OR created < $cursor_created
+        OR (created = $cursor_created AND id < $cursor_id)
+    )
+    ORDER BY created DESC, id DESC
+    LIMIT $limit
+"""
+
+
+def encode_job_cursor(created: Any, job_id: Any) -> str:
+    """Encode the last row of a page as an opaque cursor."""
+    created_iso = created.isoformat() if isinstance(created, datetime) else str(created)
+    raw = f"{created_iso}|{job_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_job_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Decode a cursor from encode_job_cursor; raises InvalidInputError if malformed."""
+    try:
+        created_iso, job_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        )
+        return datetime.fromisoformat(created_iso), ensure_record_id(job_id)
+    except Exception as e:
+        raise InvalidInputError(f"Invalid cursor: {cursor}") from e
+
 
 class CommandService:
     """Generic service layer for command operations"""
@@ -73,11 +113,48 @@ class CommandService:
         command_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
         limit: int = 50,
-    ) -> List[Dict[str, Any]]:
-        """List command jobs with optional filtering"""
-        # This will be implemented with proper SurrealDB queries
-        # For now, return empty list as this is foundation phase
-        return []
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List command jobs, newest first, with optional filtering.
+
+        Filters and the keyset cursor are applied in the query itself; the
+        returned cursor is None once there are no further pages.
+        """
+        cursor_created, cursor_id = (
+            decode_job_cursor(cursor) if cursor else (None, None)
+        )
+        rows = await repo_query(
+            LIST_COMMAND_JOBS_QUERY,
+            {
+                "app": module_filter,
+                "name": command_filter,
+                "status": status_filter,
+                "cursor_created": cursor_created,
+                "cursor_id": cursor_id,
+                # One extra row tells us whether another page exists
+                "limit": limit + 1,
+            },
+        )
+        page = rows[:limit]
+        next_cursor = (
+            encode_job_cursor(page[-1]["created"], page[-1]["id"])
+            if len(rows) > limit
+            else None
+        )
+        jobs = [
+            {
+                "job_id": str(row["id"]),
+                "app": row.get("app"),
+                "command": row.get("name"),
+                "status": row.get("status"),
+                "error_message": row.get("error_message"),
+                "created": str(row["created"]) if row.get("created") else None,
+                "updated": str(row["updated"]) if row.get("updated") else None,
+                "progress": row.get("progress"),
+            }
+            for row in page
+        ]
+        return jobs, next_cursor
 
     @staticmethod
     async def cancel_command_job(job_id: str) -> bool:
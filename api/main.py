@@ -3,15 +3,21 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import asyncio
+import os
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from loguru import logger
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from api.auth import PasswordAuthMiddleware
+from api.responses import OrjsonResponse
 from api.routers import (
     auth,
     chat,
@@ -35,6 +41,13 @@ from api.routers import (
 )
 from api.routers import commands as commands_router
 from open_notebook.database.async_migrate import AsyncMigrationManager
+from open_notebook.database.repository import close_db_pool, init_db_pool
+from open_notebook.exceptions import InvalidInputError, NotFoundError
+from open_notebook.graphs.chat import compile_graph as compile_chat_graph
+from open_notebook.graphs.chat import connect_checkpoint_db
+from open_notebook.graphs.source_chat import (
+    compile_graph as compile_source_chat_graph,
+)
 
 # Import commands to register them in the API process
 try:
@@ -43,6 +56,40 @@ except Exception as e:
     logger.error(f"Failed to import commands in API process: {e}")
 
 
+def _is_chat_record(record) -> bool:
+    """Loguru filter for the chat log: matches records bound with chat=True."""
+    return record["extra"].get("chat") is True
+
+
+ROOT_PAYLOAD = {"message": "Open Notebook API is running"}
+HEALTH_PAYLOAD = {"status": "healthy"}
+
+
+class ProbeFastPathMiddleware:
+    """
+    Answers GET / and GET /health before any other middleware runs.
+
+    Liveness probes hit these far more often than any real endpoint and need
+    neither CORS, compression nor auth, so the prebuilt responses are sent
+    straight from the outermost layer.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.responses = {
+            "/": JSONResponse(ROOT_PAYLOAD),
+            "/health": JSONResponse(HEALTH_PAYLOAD),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "GET":
+            response = self.responses.get(scope["path"])
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -51,13 +98,44 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Run database migrations
     logger.info("Starting API initialization...")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+
+    # Blocking helpers run in AnyIO's thread pool; raise its default of 40
+    # so concurrent requests don't queue behind it
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+
+    # Daily rotating log of chat executions (see logger.bind(chat=True) in chat router).
+    # enqueue=True hands records to a background writer so file I/O stays off the event loop.
+    chat_log_sink = logger.add(
+        "logs/chat_{time:YYYY-MM-DD}.log",
+        rotation="00:00",
+        retention="30 days",
+        enqueue=True,
+        filter=_is_chat_record,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {message}",
+    )
+
+    # Reuse SurrealDB connections across requests instead of one per query
+    db_pool = await init_db_pool()
+    logger.info(
+        f"Database connection pool ready "
+        f"(min_size={db_pool.min_size}, max_size={db_pool.max_size})"
+    )
+
+    # The chat graphs' async checkpointers need the running loop, so they are
+    # built here rather than at import; routes read them from app.state
+    app.state.checkpoint_conn = await connect_checkpoint_db()
+    app.state.chat_graph = compile_chat_graph(app.state.checkpoint_conn)
+    app.state.source_chat_graph = compile_source_chat_graph(app.state.checkpoint_conn)
 
     try:
         migration_manager = AsyncMigrationManager()
+        # Always ask the database: a wiped or restored instance must fail fast
+        # or migrate rather than trust anything remembered locally
         current_version = await migration_manager.get_current_version()
         logger.info(f"Current database version: {current_version}")
 
-        if await migration_manager.needs_migration():
+        if current_version < migration_manager.expected_version:
             logger.warning("Database migrations are pending. Running migrations...")
             await migration_manager.run_migration_up()
             new_version = await migration_manager.get_current_version()
@@ -80,12 +158,17 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown: cleanup if needed
+    # aiosqlite's worker thread would otherwise keep the process alive
+    await app.state.checkpoint_conn.close()
+    await close_db_pool()
+    logger.remove(chat_log_sink)  # Flushes and stops the enqueue worker
     logger.info("API shutdown complete")
 
 
 app = FastAPI(
     title="Open Notebook API",
     description="API for Open Notebook - Research Assistant",
+    default_response_class=OrjsonResponse,
     lifespan=lifespan,
 )
 
@@ -105,14 +188,48 @@ app.add_middleware(
 )
 
 # Add CORS middleware last (so it processes first)
+# CORS_ORIGINS is a comma-separated allow-list; the default "*" keeps the
+# permissive behaviour. Methods and headers are explicit so Starlette builds
+# the preflight headers once instead of echoing the request's.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    # Lets browser clients read pagination cursors
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress large JSON payloads (source lists, search results, context).
+# Added after CORS so it wraps it and compresses the final response.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Outermost: probes short-circuit the whole stack above
+app.add_middleware(ProbeFastPathMiddleware)
+
+
+def _cors_error_headers(request: Request) -> dict:
+    """CORS headers for error responses built outside the CORS middleware.
+
+    The origin is only echoed when the CORS_ORIGINS allow-list admits it, so
+    error responses don't bypass the list.
+    """
+    origin = request.headers.get("origin")
+    if origin is None or ("*" not in CORS_ORIGINS and origin not in CORS_ORIGINS):
+        return {}
+    return {
+        "Access-Control-Allow-Origin": origin,
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Allow-Methods": "*",
+        "Access-Control-Allow-Headers": "*",
+    }
+
 
 # Custom exception handler to ensure CORS headers are included in error responses
 # This helps when errors occur before the CORS middleware can process them
@@ -126,51 +243,84 @@ async def custom_http_exception_handler(request: Request, exc: StarletteHTTPExce
     FastAPI, this handler won't be called. In that case, configure your reverse proxy
     to add CORS headers to error responses.
     """
-    # Get the origin from the request
-    origin = request.headers.get("origin", "*")
-
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
-        headers={
-            **(exc.headers or {}), "Access-Control-Allow-Origin": origin,
-            "Access-Control-Allow-Credentials": "true",
-            "Access-Control-Allow-Methods": "*",
-            "Access-Control-Allow-Headers": "*",
-        },
+        headers={**(exc.headers or {}), **_cors_error_headers(request)},
+    )
+
+
+# Domain errors that escape a router map to client errors
+@app.exception_handler(InvalidInputError)
+async def invalid_input_exception_handler(request: Request, exc: InvalidInputError):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)},
+        headers=_cors_error_headers(request),
+    )
+
+
+@app.exception_handler(NotFoundError)
+async def not_found_exception_handler(request: Request, exc: NotFoundError):
+    return JSONResponse(
+        status_code=404,
+        content={"detail": str(exc)},
+        headers=_cors_error_headers(request),
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """
+    Last-resort handler so routers don't need their own try/except blocks.
+
+    Starlette runs it outside the middleware stack, hence the explicit CORS
+    headers. Cancellation is a BaseException and is never routed here.
+    """
+    logger.opt(exception=exc).error(
+        f"Unhandled error on {request.method} {request.url.path}: {exc}"
+    )
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"},
+        headers=_cors_error_headers(request),
     )
 
 
 # Include routers
-app.include_router(auth.router, prefix="/api", tags=["auth"])
-app.include_router(config.router, prefix="/api", tags=["config"])
-app.include_router(notebooks.router, prefix="/api", tags=["notebooks"])
-app.include_router(prompts.router, prefix="/api", tags=["prompts"])
-app.include_router(search.router, prefix="/api", tags=["search"])
-app.include_router(models.router, prefix="/api", tags=["models"])
-app.include_router(transformations.router, prefix="/api", tags=["transformations"])
-app.include_router(notes.router, prefix="/api", tags=["notes"])
-app.include_router(embedding.router, prefix="/api", tags=["embedding"])
-app.include_router(
-    embedding_rebuild.router, prefix="/api/embeddings", tags=["embeddings"]
+ROUTERS = (
+    (auth.router, "/api", "auth"),
+    (config.router, "/api", "config"),
+    (notebooks.router, "/api", "notebooks"),
+    (prompts.router, "/api", "prompts"),
+    (search.router, "/api", "search"),
+    (models.router, "/api", "models"),
+    (transformations.router, "/api", "transformations"),
+    (notes.router, "/api", "notes"),
+    (embedding.router, "/api", "embedding"),
+    (embedding_rebuild.router, "/api/embeddings", "embeddings"),
+    (settings.router, "/api", "settings"),
+    (context.router, "/api", "context"),
+    (sources.router, "/api", "sources"),
+    (insights.router, "/api", "insights"),
+    (commands_router.router, "/api", "commands"),
+    (podcasts.router, "/api", "podcasts"),
+    (episode_profiles.router, "/api", "episode-profiles"),
+    (speaker_profiles.router, "/api", "speaker-profiles"),
+    (chat.router, "/api", "chat"),
+    (source_chat.router, "/api", "source-chat"),
 )
-app.include_router(settings.router, prefix="/api", tags=["settings"])
-app.include_router(context.router, prefix="/api", tags=["context"])
-app.include_router(sources.router, prefix="/api", tags=["sources"])
-app.include_router(insights.router, prefix="/api", tags=["insights"])
-app.include_router(commands_router.router, prefix="/api", tags=["commands"])
-app.include_router(podcasts.router, prefix="/api", tags=["podcasts"])
-app.include_router(episode_profiles.router, prefix="/api", tags=["episode-profiles"])
-app.include_router(speaker_profiles.router, prefix="/api", tags=["speaker-profiles"])
-app.include_router(chat.router, prefix="/api", tags=["chat"])
-app.include_router(source_chat.router, prefix="/api", tags=["source-chat"])
+
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
 
 
+# Served by ProbeFastPathMiddleware; the routes keep both in the OpenAPI docs
 @app.get("/")
 async def root():
-    return {"message": "Open Notebook API is running"}
+    return ROOT_PAYLOAD
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return HEALTH_PAYLOAD
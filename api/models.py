@@ -1,7 +1,15 @@
-from typing import Any, Dict, List, Literal, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+# Shared field types, reused across request/response models
+NotebookId = Annotated[
+    Optional[str],
+    Field(description="Notebook ID to add the item to | 要加入項目的筆記本 ID"),
+]
+TransformationId = Annotated[str, Field(description="Transformation ID | 轉換 ID")]
+ModelId = Annotated[str, Field(description="Model ID | 模型 ID")]
+
 
 # Notebook models
 class NotebookCreate(BaseModel):
@@ -34,6 +42,9 @@ class NotebookResponse(BaseModel):
 
 # Search models
 class SearchRequest(BaseModel):
+    # Read-only request body
+    model_config = ConfigDict(frozen=True)
+
     query: str = Field(..., description="Search query | 搜尋查詢字串")
     type: Literal["text", "vector"] = Field("text", description="Search type | 搜尋類型")
     limit: int = Field(100, description="Maximum number of results | 最大回傳結果數", le=1000)
@@ -51,6 +62,8 @@ class SearchResponse(BaseModel):
 
 
 class AskRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     question: str = Field(..., description="Question to ask the knowledge base | 要詢問知識庫的問題")
     strategy_model: str = Field(..., description="Model ID for query strategy | 查詢策略使用的模型 ID")
     answer_model: str = Field(..., description="Model ID for individual answers | 個別回答使用的模型 ID")
@@ -142,19 +155,17 @@ class TransformationResponse(BaseModel):
 class TransformationExecuteRequest(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
 
-    transformation_id: str = Field(
-        ..., description="ID of the transformation to execute | 要執行的轉換 ID"
-    )
+    transformation_id: TransformationId
     input_text: str = Field(..., description="Text to transform | 要轉換的文字")
-    model_id: str = Field(..., description="Model ID to use for the transformation | 轉換使用的模型 ID")
+    model_id: ModelId
 
 
 class TransformationExecuteResponse(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
 
     output: str = Field(..., description="Transformed text | 轉換後的文字")
-    transformation_id: str = Field(..., description="ID of the transformation used | 使用的轉換 ID")
-    model_id: str = Field(..., description="Model ID used | 已使用的模型 ID")
+    transformation_id: TransformationId
+    model_id: ModelId
 
 
 # Default Prompt API models
@@ -175,9 +186,7 @@ class NoteCreate(BaseModel):
     title: Optional[str] = Field(None, description="Note title | 筆記標題")
     content: str = Field(..., description="Note content | 筆記內容")
     note_type: Optional[str] = Field("human", description="Type of note (human, ai) | 筆記類型（human、ai）")
-    notebook_id: Optional[str] = Field(
-        None, description="Notebook ID to add the note to | 要新增筆記的筆記本 ID"
-    )
+    notebook_id: NotebookId = None
 
 
 class NoteUpdate(BaseModel):
@@ -304,24 +313,32 @@ class SourceCreate(BaseModel):
         False, description="Whether to process source asynchronously | 是否以非同步方式處理來源"
     )
 
-    @model_validator(mode="after")
-    def validate_notebook_fields(self):
+    @model_validator(mode="before")
+    @classmethod
+    def validate_notebook_fields(cls, data: Any) -> Any:
+        # Normalize the raw input before field validation so no second pass
+        # over the constructed model is needed
+        if not isinstance(data, dict):
+            return data
+
+        notebook_id = data.get("notebook_id")
+        notebooks = data.get("notebooks")
+
         # Ensure only one of notebook_id or notebooks is provided
-        if self.notebook_id is not None and self.notebooks is not None:
+        if notebook_id is not None and notebooks is not None:
             raise ValueError(
                 "Cannot specify both 'notebook_id' and 'notebooks'. Use 'notebooks' for multi-notebook support."
             )
 
         # Convert single notebook_id to notebooks array for internal processing
-        if self.notebook_id is not None:
-            self.notebooks = [self.notebook_id]
-            # Keep notebook_id for backward compatibility in response
-
+        # (notebook_id is kept for backward compatibility in response).
         # Set empty array if no notebooks specified (allow sources without notebooks)
-        if self.notebooks is None:
-            self.notebooks = []
+        if notebook_id is not None:
+            data = {**data, "notebooks": [notebook_id]}
+        elif notebooks is None:
+            data = {**data, "notebooks": []}
 
-        return self
+        return data
 
 
 class SourceUpdate(BaseModel):
@@ -400,13 +417,13 @@ class SourceInsightResponse(BaseModel):
 
 
 class SaveAsNoteRequest(BaseModel):
-    notebook_id: Optional[str] = Field(None, description="Notebook ID to add note to | 要新增筆記的筆記本 ID")
+    notebook_id: NotebookId = None
 
 
 class CreateSourceInsightRequest(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
 
-    transformation_id: str = Field(..., description="ID of transformation to apply | 要套用的轉換 ID")
+    transformation_id: TransformationId
     model_id: Optional[str] = Field(
         None, description="Model ID (uses default if not provided) | 模型 ID（未提供時使用預設值）"
     )
@@ -0,0 +1,47 @@
+from typing import Any, Callable, Mapping, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.background import BackgroundTask
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    Used as the app's default response class. Defined here rather than using
+    fastapi.responses.ORJSONResponse, which newer FastAPI releases deprecate.
+
+    ``default`` is passed to orjson for objects it cannot encode natively, so a
+    list of domain objects can be shaped one item at a time while encoding.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        *,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        # Set before super().__init__, which renders the content; the explicit
+        # status_code default is also what FastAPI's OpenAPI generator reads
+        self._default = default
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=self._default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
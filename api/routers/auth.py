@@ -9,6 +9,16 @@ from fastapi import APIRouter
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# The password is read once at startup (same as PasswordAuthMiddleware), so the
+# status response is constant for the lifetime of the process.
+_AUTH_ENABLED = bool(os.environ.get("OPEN_NOTEBOOK_PASSWORD"))
+_STATUS_RESPONSE = {
+    "auth_enabled": _AUTH_ENABLED,
+    "message": "Authentication is required"
+    if _AUTH_ENABLED
+    else "Authentication is disabled",
+}
+
 
 @router.get("/status")
 async def get_auth_status():
@@ -20,11 +30,4 @@ async def get_auth_status():
     Returns whether a password is required to access the API.
     返回是否需要密碼才能訪問 API。
     """
-    auth_enabled = bool(os.environ.get("OPEN_NOTEBOOK_PASSWORD"))
-
-    return {
-        "auth_enabled": auth_enabled,
-        "message": "Authentication is required"
-        if auth_enabled
-        else "Authentication is disabled",
-    }
+    return _STATUS_RESPONSE
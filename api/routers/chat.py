@@ -1,22 +1,49 @@
 import asyncio
+import hashlib
+import os
 import time
 import traceback
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncGenerator, Callable, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query
+import orjson
+from cachetools import LRUCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import AIMessageChunk, BaseMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import CompiledStateGraph
 from loguru import logger
 from pydantic import BaseModel, Field
-
-from open_notebook.database.repository import ensure_record_id, repo_query
-from open_notebook.domain.notebook import ChatSession, Note, Notebook, Source
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from api.responses import OrjsonResponse
+from open_notebook.ai.models import DefaultModels, Model
+from open_notebook.database.repository import ensure_record_id
+from open_notebook.domain.notebook import (
+    ChatSession,
+    Note,
+    Notebook,
+    Source,
+    SystemPrompt,
+)
 from open_notebook.exceptions import (
     NotFoundError,
 )
-from open_notebook.graphs.chat import graph as chat_graph
+
+try:
+    from open_notebook.utils import token_count as _token_count
+except ImportError:
+    _token_count = None  # type: ignore[assignment]
 
 router = APIRouter()
 
+# Per-step (llm/db) timings in the chat log; read once at import
+PROFILE_CHAT = os.getenv("PROFILE_CHAT") == "1"
+
+# Token counts of build_context chunks, keyed by a digest of the chunk text
+_chunk_token_cache: LRUCache = LRUCache(maxsize=4096)
+
 
 # Request/Response models
 class CreateSessionRequest(BaseModel):
@@ -99,6 +126,31 @@ class SuccessResponse(BaseModel):
     message: str = Field(..., description="Success message")
 
 
+def _serialize_messages(raw_messages: List[BaseMessage]) -> List[Dict[str, Any]]:
+    """Convert LangChain messages to ChatMessage-shaped dicts."""
+    # LangChain messages don't have timestamps by default
+    return [
+        {
+            "id": msg.id or f"msg_{index}",
+            "type": msg.type,
+            "content": msg.content
+            if isinstance(msg.content, str)
+            else str(msg.content),
+            "timestamp": None,
+        }
+        for index, msg in enumerate(raw_messages)
+    ]
+
+
+def _full_session_id(session_id: str) -> str:
+    """Ensure a session ID has the chat_session table prefix."""
+    return (
+        session_id
+        if session_id.startswith("chat_session:")
+        else f"chat_session:{session_id}"
+    )
+
+
 @router.get("/chat/sessions", response_model=List[ChatSessionResponse])
 async def get_sessions(notebook_id: str = Query(..., description="Notebook ID")):
     """Get all chat sessions for a notebook."""
@@ -111,8 +163,10 @@ async def get_sessions(notebook_id: str = Query(..., description="Notebook ID"))
         # Get sessions for this notebook
         sessions = await notebook.get_chat_sessions()
 
+        # Responses are built from database rows we already trust, so
+        # model_construct skips a redundant validation per session
         return [
-            ChatSessionResponse(
+            ChatSessionResponse.model_construct(
                 id=session.id or "",
                 title=session.title or "Untitled Session",
                 notebook_id=notebook_id,
@@ -143,8 +197,7 @@ async def create_session(request: CreateSessionRequest):
 
         # Create new session
         session = ChatSession(
-            title=request.title
-            or f"Chat Session {asyncio.get_event_loop().time():.0f}",
+            title=request.title or f"Chat Session {int(time.time())}",
             model_override=request.model_override,
         )
         await session.save()
@@ -152,7 +205,7 @@ async def create_session(request: CreateSessionRequest):
         # Relate session to notebook
         await session.relate_to_notebook(request.notebook_id)
 
-        return ChatSessionResponse(
+        return ChatSessionResponse.model_construct(
             id=session.id or "",
             title=session.title or "",
             notebook_id=request.notebook_id,
@@ -170,55 +223,35 @@ async def create_session(request: CreateSessionRequest):
         )
 
 
+def _get_chat_graph(request: Request) -> CompiledStateGraph:
+    """The chat graph compiled in the app lifespan."""
+    return request.app.state.chat_graph
+
+
+# Hot endpoints below return prebuilt dicts; the models are declared for docs
 @router.get(
-    "/chat/sessions/{session_id}", response_model=ChatSessionWithMessagesResponse
+    "/chat/sessions/{session_id}",
+    responses={200: {"model": ChatSessionWithMessagesResponse}},
 )
-async def get_session(session_id: str):
+async def get_session(
+    session_id: str, chat_graph: CompiledStateGraph = Depends(_get_chat_graph)
+):
     """Get a specific session with its messages."""
     try:
         # Get session
-        # Ensure session_id has proper table prefix
-        full_session_id = (
-            session_id
-            if session_id.startswith("chat_session:")
-            else f"chat_session:{session_id}"
-        )
-        session = await ChatSession.get(full_session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+        full_session_id = _full_session_id(session_id)
+        session, notebook = await ChatSession.get_with_notebook(full_session_id)
+        notebook_id = notebook.id if notebook else None
 
         # Get session state from LangGraph to retrieve messages
-        thread_state = chat_graph.get_state(
-            config=RunnableConfig(configurable={"thread_id": session_id})
+        thread_state = await chat_graph.aget_state(
+            RunnableConfig(configurable={"thread_id": session_id})
         )
 
         # Extract messages from state
-        messages: list[ChatMessage] = []
+        messages: list[dict[str, Any]] = []
         if thread_state and thread_state.values and "messages" in thread_state.values:
-            for msg in thread_state.values["messages"]:
-                messages.append(
-                    ChatMessage(
-                        id=getattr(msg, "id", f"msg_{len(messages)}"),
-                        type=msg.type if hasattr(msg, "type") else "unknown",
-                        content=msg.content if hasattr(msg, "content") else str(msg),
-                        timestamp=None,  # LangChain messages don't have timestamps by default
-                    )
-                )
-
-        # Find notebook_id (we need to query the relationship)
-        # Ensure session_id has proper table prefix
-        full_session_id = (
-            session_id
-            if session_id.startswith("chat_session:")
-            else f"chat_session:{session_id}"
-        )
-
-        notebook_query = await repo_query(
-            "SELECT out FROM refers_to WHERE in = $session_id",
-            {"session_id": ensure_record_id(full_session_id)},
-        )
-
-        notebook_id = str(notebook_query[0]["out"]) if notebook_query else None
+            messages = _serialize_messages(thread_state.values["messages"])
 
         if not notebook_id:
             # This might be an old session created before API migration
@@ -226,15 +259,17 @@ async def get_session(session_id: str):
                 f"No notebook relationship found for session {session_id} - may be an orphaned session"
             )
 
-        return ChatSessionWithMessagesResponse(
-            id=session.id or "",
-            title=session.title or "Untitled Session",
-            notebook_id=notebook_id,
-            created=str(session.created),
-            updated=str(session.updated),
-            message_count=len(messages),
-            messages=messages,
-            model_override=getattr(session, "model_override", None),
+        return OrjsonResponse(
+            {
+                "id": session.id or "",
+                "title": session.title or "Untitled Session",
+                "notebook_id": notebook_id,
+                "created": str(session.created),
+                "updated": str(session.updated),
+                "message_count": len(messages),
+                "model_override": getattr(session, "model_override", None),
+                "messages": messages,
+            }
         )
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -247,43 +282,19 @@ async def get_session(session_id: str):
 async def update_session(session_id: str, request: UpdateSessionRequest):
     """Update session title."""
     try:
-        # Ensure session_id has proper table prefix
-        full_session_id = (
-            session_id
-            if session_id.startswith("chat_session:")
-            else f"chat_session:{session_id}"
-        )
-        session = await ChatSession.get(full_session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        update_data = request.model_dump(exclude_unset=True)
-
-        if "title" in update_data:
-            session.title = update_data["title"]
+        full_session_id = _full_session_id(session_id)
+        session, notebook = await ChatSession.get_with_notebook(full_session_id)
 
-        if "model_override" in update_data:
-            session.model_override = update_data["model_override"]
+        # Apply only the fields the client sent (explicit nulls included)
+        for field, value in request.model_dump(exclude_unset=True).items():
+            setattr(session, field, value)
 
         await session.save()
 
-        # Find notebook_id
-        # Ensure session_id has proper table prefix
-        full_session_id = (
-            session_id
-            if session_id.startswith("chat_session:")
-            else f"chat_session:{session_id}"
-        )
-        notebook_query = await repo_query(
-            "SELECT out FROM refers_to WHERE in = $session_id",
-            {"session_id": ensure_record_id(full_session_id)},
-        )
-        notebook_id = notebook_query[0]["out"] if notebook_query else None
-
-        return ChatSessionResponse(
+        return ChatSessionResponse.model_construct(
             id=session.id or "",
             title=session.title or "",
-            notebook_id=notebook_id,
+            notebook_id=notebook.id if notebook else None,
             created=str(session.created),
             updated=str(session.updated),
             message_count=0,
@@ -300,12 +311,7 @@ async def update_session(session_id: str, request: UpdateSessionRequest):
 async def delete_session(session_id: str):
     """Delete a chat session."""
     try:
-        # Ensure session_id has proper table prefix
-        full_session_id = (
-            session_id
-            if session_id.startswith("chat_session:")
-            else f"chat_session:{session_id}"
-        )
+        full_session_id = _full_session_id(session_id)
         session = await ChatSession.get(full_session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -320,101 +326,163 @@ async def delete_session(session_id: str):
         raise HTTPException(status_code=500, detail=f"Error deleting session: {str(e)}")
 
 
-@router.post("/chat/execute", response_model=ExecuteChatResponse)
-async def execute_chat(request: ExecuteChatRequest):
-    """Execute a chat request and get AI response."""
+async def _get_prompt_content(prompt_id: Optional[str]) -> Optional[str]:
+    """Fetch a system prompt's content by ID; None if unset or unavailable."""
+    if not prompt_id:
+        return None
     try:
-        # Performance tracking
-        total_start = time.time()
-        db_duration = 0
-        llm_duration = 0
-
-        # Verify session exists
-        # Ensure session_id has proper table prefix
-        db_start = time.time()
-        full_session_id = (
-            request.session_id
-            if request.session_id.startswith("chat_session:")
-            else f"chat_session:{request.session_id}"
+        full_prompt_id = (
+            prompt_id
+            if prompt_id.startswith("system_prompt:")
+            else f"system_prompt:{prompt_id}"
         )
-        session = await ChatSession.get(full_session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        db_duration += (time.time() - db_start) * 1000
+        return await SystemPrompt.get_content(full_prompt_id)
+    except Exception as e:
+        logger.warning(f"Failed to get specified prompt {prompt_id}: {e}")
+        return None
 
-        # Determine model override (per-request override takes precedence over session-level)
-        model_override = (
-            request.model_override
-            if request.model_override is not None
-            else getattr(session, "model_override", None)
-        )
 
-        # Get notebook_id from session to fetch custom_system_prompt
-        notebook_query = await repo_query(
-            "SELECT out FROM refers_to WHERE in = $session_id",
-            {"session_id": ensure_record_id(full_session_id)},
-        )
-        notebook_id = notebook_query[0]["out"] if notebook_query else None
-
-        # Get custom_system_prompt from notebook (not session)
-        # Priority: request.prompt_id > active_prompt_id > custom_system_prompt
-        custom_system_prompt = None
-        if notebook_id:
-            notebook = await Notebook.get(notebook_id)
-            if notebook:
-                # First priority: prompt_id from request (user's explicit choice)
-                if request.prompt_id:
-                    from open_notebook.domain.notebook import SystemPrompt
-
-                    try:
-                        full_prompt_id = (
-                            request.prompt_id
-                            if request.prompt_id.startswith("system_prompt:")
-                            else f"system_prompt:{request.prompt_id}"
-                        )
-                        specified_prompt = await SystemPrompt.get(full_prompt_id)
-                        custom_system_prompt = specified_prompt.content
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to get specified prompt {request.prompt_id}: {e}"
-                        )
-
-                # Second priority: active prompt from notebook
-                if not custom_system_prompt and notebook.active_prompt_id:
-                    active_prompt = await notebook.get_active_prompt()
-                    if active_prompt:
-                        custom_system_prompt = active_prompt.content
-
-                # Third priority: custom_system_prompt field (legacy)
-                if not custom_system_prompt and notebook.custom_system_prompt:
-                    custom_system_prompt = notebook.custom_system_prompt
-
-        # Get current state
-        current_state = chat_graph.get_state(
-            config=RunnableConfig(configurable={"thread_id": request.session_id})
-        )
+async def _resolve_custom_system_prompt(
+    notebook: Optional[Notebook], requested_prompt: Optional[str]
+) -> Optional[str]:
+    """
+    Resolve the system prompt for a chat message from the session's notebook.
 
-        # Prepare state for execution
-        state_values = current_state.values if current_state else {}
-        state_values["messages"] = state_values.get("messages", [])
-        state_values["context"] = request.context
-        state_values["model_override"] = model_override
-        state_values["custom_system_prompt"] = custom_system_prompt
-        state_values["include_citations"] = request.include_citations
+    Priority: prompt requested for this message > notebook active prompt >
+    notebook custom_system_prompt (legacy).
+    """
+    if not notebook:
+        return None
 
-        # Add user message to state
-        from langchain_core.messages import HumanMessage
+    custom_system_prompt = requested_prompt
+    if not custom_system_prompt and notebook.active_prompt_id:
+        try:
+            custom_system_prompt = await SystemPrompt.get_content(
+                notebook.active_prompt_id
+            )
+        except Exception as e:
+            logger.error(
+                f"Error fetching active prompt for notebook {notebook.id}: {str(e)}"
+            )
+
+    if not custom_system_prompt and notebook.custom_system_prompt:
+        custom_system_prompt = notebook.custom_system_prompt
 
-        user_message = HumanMessage(content=request.message)
-        state_values["messages"].append(user_message)
+    return custom_system_prompt
+
+
+async def _prepare_chat_state(
+    request: ExecuteChatRequest, chat_graph: CompiledStateGraph
+) -> Tuple[ChatSession, Dict[str, Any], Optional[str]]:
+    """Load the session and build the graph input for a chat turn."""
+    full_session_id = _full_session_id(request.session_id)
+
+    # Session + notebook come back in one query; the requested prompt
+    # is fetched alongside it
+    (session, notebook), requested_prompt = await asyncio.gather(
+        ChatSession.get_with_notebook(full_session_id),
+        _get_prompt_content(request.prompt_id),
+    )
+
+    # Determine model override (per-request override takes precedence over session-level)
+    model_override = (
+        request.model_override
+        if request.model_override is not None
+        else getattr(session, "model_override", None)
+    )
+
+    # Read the LangGraph state while the active prompt is resolved
+    state_task = asyncio.ensure_future(
+        chat_graph.aget_state(
+            RunnableConfig(configurable={"thread_id": request.session_id})
+        )
+    )
+    custom_system_prompt = await _resolve_custom_system_prompt(
+        notebook, requested_prompt
+    )
+    current_state = await state_task
+
+    # Prepare state for execution
+    state_values = current_state.values if current_state else {}
+    state_values["messages"] = state_values.get("messages", [])
+    state_values["context"] = request.context
+    state_values["model_override"] = model_override
+    state_values["custom_system_prompt"] = custom_system_prompt
+    state_values["include_citations"] = request.include_citations
+
+    # Add user message to state
+    state_values["messages"].append(HumanMessage(content=request.message))
+
+    return session, state_values, model_override
+
+
+async def _log_chat_summary(
+    session_id: str,
+    model_override: Optional[str],
+    timings: str,
+    sources_count: int,
+    notes_count: int,
+    message: str,
+) -> None:
+    """Write the [CHAT] line for one execution to the chat log."""
+    # Get model name from model_override ID
+    model_display = "unknown"
+    try:
+        if model_override:
+            # Use specified model
+            model_obj = await Model.get(model_override)
+            if model_obj:
+                model_display = f"{model_override} ({model_obj.name})"
+        else:
+            # Get default chat model
+            defaults = await DefaultModels.get_instance()
+            default_model_id = defaults.default_chat_model
+            if default_model_id:
+                model_obj = await Model.get(default_model_id)
+                if model_obj:
+                    model_display = f"{default_model_id} ({model_obj.name})"
+    except Exception as e:
+        logger.warning(f"Failed to get model name: {e}")
+        model_display = model_override if model_override else "default"
+
+    logger.bind(chat=True).info(
+        f"[CHAT] session={session_id} | "
+        f"model={model_display} | "
+        f"{timings} | "
+        f"sources={sources_count} | "
+        f"notes={notes_count} | "
+        f"msg={message[:50]}"
+    )
+
+
+@router.post("/chat/execute", responses={200: {"model": ExecuteChatResponse}})
+async def execute_chat(
+    request: ExecuteChatRequest,
+    chat_graph: CompiledStateGraph = Depends(_get_chat_graph),
+):
+    """Execute a chat request and get AI response."""
+    try:
+        # Performance tracking (per-step breakdown only with PROFILE_CHAT=1)
+        total_start = time.perf_counter()
+        db_duration = 0.0
+        llm_duration = 0.0
+
+        if PROFILE_CHAT:
+            db_start = time.perf_counter()
+        session, state_values, model_override = await _prepare_chat_state(
+            request, chat_graph
+        )
+        if PROFILE_CHAT:
+            db_duration += (time.perf_counter() - db_start) * 1000
 
         # Count context items
         sources_count = len(request.context.get("sources", []))
         notes_count = len(request.context.get("notes", []))
 
         # Execute chat graph
-        llm_start = time.time()
-        result = chat_graph.invoke(
+        if PROFILE_CHAT:
+            llm_start = time.perf_counter()
+        result = await chat_graph.ainvoke(
             input=state_values,  # type: ignore[arg-type]
             config=RunnableConfig(
                 configurable={
@@ -423,62 +491,34 @@ async def execute_chat(request: ExecuteChatRequest):
                 }
             ),
         )
-        llm_duration = (time.time() - llm_start) * 1000
+        if PROFILE_CHAT:
+            llm_duration = (time.perf_counter() - llm_start) * 1000
 
-        # Update session timestamp
-        db_start = time.time()
-        await session.save()
-        db_duration += (time.time() - db_start) * 1000
+        # Only a completed turn bumps the session's updated timestamp
+        await session.touch()
 
         # Convert messages to response format
-        messages: list[ChatMessage] = []
-        for msg in result.get("messages", []):
-            messages.append(
-                ChatMessage(
-                    id=getattr(msg, "id", f"msg_{len(messages)}"),
-                    type=msg.type if hasattr(msg, "type") else "unknown",
-                    content=msg.content if hasattr(msg, "content") else str(msg),
-                    timestamp=None,
-                )
-            )
+        messages = _serialize_messages(result.get("messages", []))
 
         # Calculate total duration
-        total_duration = (time.time() - total_start) * 1000
-
-        # Get model name from model_override ID
-        model_display = "unknown"
-        try:
-            from open_notebook.ai.models import DefaultModels, Model
-
-            if model_override:
-                # Use specified model
-                model_obj = await Model.get(model_override)
-                if model_obj:
-                    model_display = f"{model_override} ({model_obj.name})"
-            else:
-                # Get default chat model
-                defaults = await DefaultModels.get_instance()
-                default_model_id = defaults.default_chat_model
-                if default_model_id:
-                    model_obj = await Model.get(default_model_id)
-                    if model_obj:
-                        model_display = f"{default_model_id} ({model_obj.name})"
-        except Exception as e:
-            logger.warning(f"Failed to get model name: {e}")
-            model_display = model_override if model_override else "default"
-
-        logger.info(
-            f"[CHAT] session={request.session_id} | "
-            f"model={model_display} | "
-            f"total={total_duration:.0f}ms | "
-            f"llm={llm_duration:.0f}ms | "
-            f"db={db_duration:.0f}ms | "
-            f"sources={sources_count} | "
-            f"notes={notes_count} | "
-            f"msg={request.message[:50]}"
+        timings = f"total={(time.perf_counter() - total_start) * 1000:.0f}ms"
+        if PROFILE_CHAT:
+            timings += f" | llm={llm_duration:.0f}ms | db={db_duration:.0f}ms"
+
+        # The chat log line needs the model name (extra DB lookups), so it is
+        # written after the response has been sent
+        return OrjsonResponse(
+            {"session_id": request.session_id, "messages": messages},
+            background=BackgroundTask(
+                _log_chat_summary,
+                session_id=request.session_id,
+                model_override=model_override,
+                timings=timings,
+                sources_count=sources_count,
+                notes_count=notes_count,
+                message=request.message,
+            ),
         )
-
-        return ExecuteChatResponse(session_id=request.session_id, messages=messages)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
     except Exception as e:
@@ -492,7 +532,101 @@ async def execute_chat(request: ExecuteChatRequest):
         raise HTTPException(status_code=500, detail=f"Error executing chat: {str(e)}")
 
 
-@router.post("/chat/context", response_model=BuildContextResponse)
+async def stream_chat_response(
+    chat_graph: CompiledStateGraph,
+    request: ExecuteChatRequest,
+    session: ChatSession,
+    state_values: Dict[str, Any],
+    model_override: Optional[str],
+) -> AsyncGenerator[str, None]:
+    """Stream the chat response as Server-Sent Events."""
+    config = RunnableConfig(
+        configurable={"thread_id": request.session_id, "model_id": model_override}
+    )
+    try:
+        async for chunk, _metadata in chat_graph.astream(
+            state_values,  # type: ignore[arg-type]
+            config=config,
+            stream_mode="messages",
+        ):
+            if isinstance(chunk, AIMessageChunk) and chunk.content:
+                token_event = {"type": "token", "content": chunk.content}
+                yield f"data: {orjson.dumps(token_event).decode()}\n\n"
+
+        # Update session timestamp
+        await session.touch()
+
+        # Send the checkpointed history, with the cleaned AI message
+        state = await chat_graph.aget_state(config)
+        completion_event = {
+            "type": "complete",
+            "session_id": request.session_id,
+            "messages": _serialize_messages(state.values.get("messages", [])),
+        }
+        yield f"data: {orjson.dumps(completion_event).decode()}\n\n"
+
+    except Exception as e:
+        logger.error(f"Error in chat streaming: {str(e)}")
+        error_event = {"type": "error", "message": str(e)}
+        yield f"data: {orjson.dumps(error_event).decode()}\n\n"
+
+
+@router.post("/chat/execute/stream")
+async def execute_chat_stream(
+    request: ExecuteChatRequest,
+    chat_graph: CompiledStateGraph = Depends(_get_chat_graph),
+):
+    """Execute a chat request and stream the AI response token by token (SSE)."""
+    try:
+        session, state_values, model_override = await _prepare_chat_state(
+            request, chat_graph
+        )
+
+        return StreamingResponse(
+            stream_chat_response(
+                chat_graph, request, session, state_values, model_override
+            ),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                # Stop nginx from buffering the event stream
+                "X-Accel-Buffering": "no",
+            },
+        )
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found")
+    except Exception as e:
+        logger.error(f"Error starting chat stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error executing chat: {str(e)}")
+
+
+async def _count_context_tokens(chunks: List[str], count: Callable[[str], int]) -> int:
+    """Sum per-chunk token counts, tokenizing only chunks not seen before."""
+    counts: Dict[bytes, int] = {}
+    missing: Dict[bytes, str] = {}
+    keys = []
+    for chunk in chunks:
+        key = hashlib.blake2s(chunk.encode(), digest_size=8).digest()
+        keys.append(key)
+        cached = _chunk_token_cache.get(key)
+        if cached is None:
+            missing[key] = chunk
+        else:
+            counts[key] = cached
+
+    if missing:
+        # Tokenizing is CPU-bound; keep it off the event loop
+        fresh = await run_in_threadpool(
+            lambda: {key: count(chunk) for key, chunk in missing.items()}
+        )
+        _chunk_token_cache.update(fresh)
+        counts.update(fresh)
+
+    return sum(counts[key] for key in keys)
+
+
+@router.post("/chat/context", responses={200: {"model": BuildContextResponse}})
 async def build_context(request: BuildContextRequest):
     """Build context for a notebook based on context configuration."""
     try:
@@ -502,96 +636,90 @@ async def build_context(request: BuildContextRequest):
             raise HTTPException(status_code=404, detail="Notebook not found")
 
         context_data: dict[str, list[dict[str, str]]] = {"sources": [], "notes": []}
-        total_content = ""
+
+        # Sources, notes and insights are fetched in batches: one query each
+        # rather than one (or two) per item
+        source_contexts: list[Dict[str, Any]] = []
+        note_contexts: list[Dict[str, Any]] = []
 
         # Process context configuration if provided
         if request.context_config:
-            # Process sources
+            source_sizes: Dict[str, Literal["short", "long"]] = {}
             for source_id, status in request.context_config.get("sources", {}).items():
                 if "not in" in status:
                     continue
-
-                try:
-                    # Add table prefix if not present
-                    full_source_id = (
+                # Add table prefix if not present; keyed like the fetched IDs
+                full_source_id = str(
+                    ensure_record_id(
                         source_id
                         if source_id.startswith("source:")
                         else f"source:{source_id}"
                     )
-
-                    try:
-                        source = await Source.get(full_source_id)
-                    except Exception:
-                        continue
-
-                    if "insights" in status:
-                        source_context = await source.get_context(context_size="short")
-                        context_data["sources"].append(source_context)
-                        total_content += str(source_context)
-                    elif "full content" in status:
-                        source_context = await source.get_context(context_size="long")
-                        context_data["sources"].append(source_context)
-                        total_content += str(source_context)
-                except Exception as e:
-                    logger.warning(f"Error processing source {source_id}: {str(e)}")
-                    continue
-
-            # Process notes
-            for note_id, status in request.context_config.get("notes", {}).items():
-                if "not in" in status:
-                    continue
-
-                try:
-                    # Add table prefix if not present
-                    full_note_id = (
-                        note_id if note_id.startswith("note:") else f"note:{note_id}"
+                )
+                if "insights" in status:
+                    source_sizes[full_source_id] = "short"
+                elif "full content" in status:
+                    source_sizes[full_source_id] = "long"
+
+            note_ids = [
+                note_id if note_id.startswith("note:") else f"note:{note_id}"
+                for note_id, status in request.context_config.get("notes", {}).items()
+                if "not in" not in status and "full content" in status
+            ]
+
+            sources, notes = await asyncio.gather(
+                Source.get_many(list(source_sizes)), Note.get_many(note_ids)
+            )
+            insights = await Source.get_insights_for(
+                [source.id for source in sources if source.id]
+            )
+            for source in sources:
+                source_contexts.append(
+                    source.build_context(
+                        insights.get(source.id or "", []), source_sizes[source.id or ""]
                     )
-                    note = await Note.get(full_note_id)
-                    if not note:
-                        continue
-
-                    if "full content" in status:
-                        note_context = note.get_context(context_size="long")
-                        context_data["notes"].append(note_context)
-                        total_content += str(note_context)
-                except Exception as e:
-                    logger.warning(f"Error processing note {note_id}: {str(e)}")
-                    continue
+                )
+            for note in notes:
+                note_contexts.append(note.get_context(context_size="long"))
         else:
             # Default behavior - include all sources and notes with short context
-            sources = await notebook.get_sources()
+            sources, notes = await asyncio.gather(
+                notebook.get_sources(), notebook.get_notes()
+            )
+            insights = await Source.get_insights_for(
+                [source.id for source in sources if source.id]
+            )
             for source in sources:
-                try:
-                    source_context = await source.get_context(context_size="short")
-                    context_data["sources"].append(source_context)
-                    total_content += str(source_context)
-                except Exception as e:
-                    logger.warning(f"Error processing source {source.id}: {str(e)}")
-                    continue
-
-            notes = await notebook.get_notes()
+                source_contexts.append(
+                    source.build_context(insights.get(source.id or "", []), "short")
+                )
             for note in notes:
                 try:
-                    note_context = note.get_context(context_size="short")
-                    context_data["notes"].append(note_context)
-                    total_content += str(note_context)
+                    note_contexts.append(note.get_context(context_size="short"))
                 except Exception as e:
                     logger.warning(f"Error processing note {note.id}: {str(e)}")
-                    continue
 
-        # Calculate character and token counts
-        char_count = len(total_content)
-        # Use token count utility if available
-        try:
-            from open_notebook.utils import token_count
+        context_data["sources"] = source_contexts
+        context_data["notes"] = note_contexts
 
-            estimated_tokens = token_count(total_content) if total_content else 0
-        except ImportError:
-            # Fallback to simple estimation
+        # Calculate character and token counts; unchanged sources and notes
+        # reuse their cached token counts
+        content_chunks = [str(item) for item in source_contexts + note_contexts]
+        char_count = sum(len(chunk) for chunk in content_chunks)
+        # Use token count utility if available, else a simple estimate
+        if _token_count is None:
             estimated_tokens = char_count // 4
-
-        return BuildContextResponse(
-            context=context_data, token_count=estimated_tokens, char_count=char_count
+        else:
+            estimated_tokens = await _count_context_tokens(content_chunks, _token_count)
+
+        # Context can run to hundreds of KB; serialize it with orjson directly
+        # instead of revalidating it through the response model
+        return OrjsonResponse(
+            {
+                "context": context_data,
+                "token_count": estimated_tokens,
+                "char_count": char_count,
+            }
         )
     except HTTPException:
         raise
@@ -1,6 +1,10 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, Field
 from surreal_commands import registry
@@ -9,6 +13,15 @@ from api.command_service import CommandService
 
 router = APIRouter()
 
+# surreal-commands statuses after which a job no longer changes
+TERMINAL_JOB_STATUSES = {"completed", "failed", "canceled", "error"}
+# Backoff between status reads in the job stream, reset on every change
+JOB_POLL_MIN_DELAY = 0.1
+JOB_POLL_MAX_DELAY = 2.0
+
+# Serialized view of the command registry, reused by debug_registry
+_registry_snapshot: Optional[Dict[str, Any]] = None
+
 
 class CommandExecutionRequest(BaseModel):
     command: str = Field(
@@ -18,6 +31,13 @@ class CommandExecutionRequest(BaseModel):
     input: Dict[str, Any] = Field(..., description="Arguments to pass to the command")
 
 
+class CommandJobListResponse(BaseModel):
+    jobs: List[Dict[str, Any]]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to fetch the next page; null on the last page"
+    )
+
+
 class CommandJobResponse(BaseModel):
     job_id: str
     status: str
@@ -50,111 +70,146 @@ async def execute_command(request: CommandExecutionRequest):
         }
     }
     """
-    try:
-        # Submit command using app name (not module name)
-        job_id = await CommandService.submit_command_job(
-            module_name=request.app,  # This should be "open_notebook"
-            command_name=request.command,
-            command_args=request.input,
-        )
-
-        return CommandJobResponse(
-            job_id=job_id,
-            status="submitted",
-            message=f"Command '{request.command}' submitted successfully",
-        )
+    # Submit command using app name (not module name)
+    job_id = await CommandService.submit_command_job(
+        module_name=request.app,  # This should be "open_notebook"
+        command_name=request.command,
+        command_args=request.input,
+    )
 
-    except Exception as e:
-        logger.error(f"Error submitting command: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail="Failed to submit command"
-        )
+    return CommandJobResponse(
+        job_id=job_id,
+        status="submitted",
+        message=f"Command '{request.command}' submitted successfully",
+    )
 
 
 @router.get("/commands/jobs/{job_id}", response_model=CommandJobStatusResponse)
 async def get_command_job_status(job_id: str):
     """Get the status of a specific command job"""
+    status_data = await CommandService.get_command_status(job_id)
+    return CommandJobStatusResponse(**status_data)
+
+
+async def stream_command_job_status(
+    job_id: str, timeout: float
+) -> AsyncGenerator[str, None]:
+    """Stream job status changes as Server-Sent Events until the job ends."""
+    delay = JOB_POLL_MIN_DELAY
+    deadline = time.monotonic() + timeout
+    last_seen = None
     try:
-        status_data = await CommandService.get_command_status(job_id)
-        return CommandJobStatusResponse(**status_data)
+        while True:
+            status_data = await CommandService.get_command_status(job_id)
+            seen = (status_data["status"], status_data["progress"])
+            if seen != last_seen:
+                last_seen = seen
+                # Poll quickly again right after a change
+                delay = JOB_POLL_MIN_DELAY
+                event = {"type": "status", **status_data}
+                yield f"data: {orjson.dumps(event, default=str).decode()}\n\n"
+
+            if status_data["status"] in TERMINAL_JOB_STATUSES:
+                break
+            if time.monotonic() >= deadline:
+                yield f"data: {orjson.dumps({'type': 'timeout'}).decode()}\n\n"
+                break
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, JOB_POLL_MAX_DELAY)
 
     except Exception as e:
-        logger.error(f"Error fetching job status: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail="Failed to fetch job status"
-        )
+        logger.error(f"Error streaming job status: {str(e)}")
+        error_event = {"type": "error", "message": str(e)}
+        yield f"data: {orjson.dumps(error_event).decode()}\n\n"
+
+
+@router.get("/commands/jobs/{job_id}/stream")
+async def stream_command_job(
+    job_id: str,
+    timeout: float = Query(
+        25, ge=1, le=120, description="Seconds to wait before closing the stream"
+    ),
+):
+    """Wait for a job over SSE instead of polling GET /commands/jobs/{job_id}.
 
+    Sends an event whenever the status or progress changes and closes once
+    the job completes, fails or is canceled (or the timeout is reached).
+    """
+    return StreamingResponse(
+        stream_command_job_status(job_id, timeout),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            # Stop nginx from buffering the event stream
+            "X-Accel-Buffering": "no",
+        },
+    )
 
-@router.get("/commands/jobs", response_model=List[Dict[str, Any]])
+
+@router.get("/commands/jobs", response_model=CommandJobListResponse)
 async def list_command_jobs(
     command_filter: Optional[str] = Query(None, description="Filter by command name"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
-    limit: int = Query(50, description="Maximum number of jobs to return"),
+    limit: int = Query(
+        50, ge=1, le=500, description="Maximum number of jobs to return"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
 ):
-    """List command jobs with optional filtering"""
-    try:
-        jobs = await CommandService.list_command_jobs(
-            command_filter=command_filter, status_filter=status_filter, limit=limit
-        )
-        return jobs
-
-    except Exception as e:
-        logger.error(f"Error listing command jobs: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail="Failed to list command jobs"
-        )
+    """List command jobs with optional filtering, newest first"""
+    # A malformed cursor raises InvalidInputError, which the app maps to 400
+    jobs, next_cursor = await CommandService.list_command_jobs(
+        command_filter=command_filter,
+        status_filter=status_filter,
+        limit=limit,
+        cursor=cursor,
+    )
+    return {"jobs": jobs, "next_cursor": next_cursor}
 
 
 @router.delete("/commands/jobs/{job_id}")
 async def cancel_command_job(job_id: str):
     """Cancel a running command job"""
-    try:
-        success = await CommandService.cancel_command_job(job_id)
-        return {"job_id": job_id, "cancelled": success}
-
-    except Exception as e:
-        logger.error(f"Error cancelling command job: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail="Failed to cancel command job"
+    success = await CommandService.cancel_command_job(job_id)
+    return {"job_id": job_id, "cancelled": success}
+
+
+def _build_registry_snapshot(all_items: List[Any]) -> Dict[str, Any]:
+    """Serialize the registered commands in a single pass."""
+    commands_by_app: Dict[str, List[str]] = {}
+    command_items = []
+    for item in all_items:
+        commands_by_app.setdefault(item.app_id, []).append(item.name)
+        command_items.append(
+            {
+                "app_id": item.app_id,
+                "name": item.name,
+                "full_id": f"{item.app_id}.{item.name}",
+            }
         )
+    return {
+        "total_commands": len(all_items),
+        "commands_by_app": commands_by_app,
+        "command_items": command_items,
+    }
 
 
 @router.get("/commands/registry/debug")
 async def debug_registry():
     """Debug endpoint to see what commands are registered"""
+    global _registry_snapshot
     try:
-        # Get all registered commands
+        # Commands register at import time; rebuild only if the count changed
         all_items = registry.get_all_commands()
-
-        # Create JSON-serializable data
-        command_items = []
-        for item in all_items:
-            try:
-                command_items.append(
-                    {
-                        "app_id": item.app_id,
-                        "name": item.name,
-                        "full_id": f"{item.app_id}.{item.name}",
-                    }
-                )
-            except Exception as item_error:
-                logger.error(f"Error processing item: {item_error}")
-
-        # Get the basic command structure
-        try:
-            commands_dict: dict[str, list[str]] = {}
-            for item in all_items:
-                if item.app_id not in commands_dict:
-                    commands_dict[item.app_id] = []
-                commands_dict[item.app_id].append(item.name)
-        except Exception:
-            commands_dict = {}
-
-        return {
-            "total_commands": len(all_items),
-            "commands_by_app": commands_dict,
-            "command_items": command_items,
-        }
+        if (
+            _registry_snapshot is None
+            or _registry_snapshot["total_commands"] != len(all_items)
+        ):
+            _registry_snapshot = _build_registry_snapshot(all_items)
+        return _registry_snapshot
 
     except Exception as e:
         logger.error(f"Error debugging registry: {str(e)}")
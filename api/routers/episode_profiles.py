@@ -1,13 +1,53 @@
+from datetime import datetime, timezone
 from typing import List
 
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException
-from loguru import logger
 from pydantic import BaseModel, Field
+from surrealdb import RecordID  # type: ignore
 
-from open_notebook.podcasts.models import EpisodeProfile
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.podcasts.models import EpisodeProfile, clear_episode_profile_cache
 
 router = APIRouter()
 
+# Copies every field except the id, with " - Copy" appended to the name
+DUPLICATE_PROFILE_QUERY = """
+    INSERT INTO episode_profile (
+        SELECT *,
+        string::concat(name, " - Copy") AS name,
+        time::now() AS created,
+        time::now() AS updated
+        OMIT id
+        FROM $id
+    )
+"""
+
+# Profiles change rarely; the list is reused for a short while and dropped
+# whenever this router writes a profile (by-name lookups are cached by
+# EpisodeProfile.get_by_name)
+_profile_list_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+
+
+def _clear_profile_caches() -> None:
+    _profile_list_cache.clear()
+    # The raw queries below bypass EpisodeProfile.save/delete
+    clear_episode_profile_cache()
+
+
+def _profile_record_id(profile_id: str) -> RecordID:
+    """Parse a profile ID, treating IDs from other tables as not found.
+
+    The write queries below run on whatever record they are given, so this
+    keeps e.g. ``DELETE /episode-profiles/notebook:x`` away from notebooks.
+    """
+    record_id = ensure_record_id(profile_id)
+    if record_id.table_name != EpisodeProfile.table_name:
+        raise HTTPException(
+            status_code=404, detail=f"Episode profile '{profile_id}' not found"
+        )
+    return record_id
+
 
 class EpisodeProfileResponse(BaseModel):
     id: str
@@ -22,6 +62,22 @@ class EpisodeProfileResponse(BaseModel):
     num_segments: int
 
 
+def _to_response(profile: EpisodeProfile) -> EpisodeProfileResponse:
+    """Build the response from a profile the domain model already validated."""
+    return EpisodeProfileResponse.model_construct(
+        id=str(profile.id),
+        name=profile.name,
+        description=profile.description or "",
+        speaker_config=profile.speaker_config,
+        outline_provider=profile.outline_provider,
+        outline_model=profile.outline_model,
+        transcript_provider=profile.transcript_provider,
+        transcript_model=profile.transcript_model,
+        default_briefing=profile.default_briefing,
+        num_segments=profile.num_segments,
+    )
+
+
 @router.get("/episode-profiles", response_model=List[EpisodeProfileResponse])
 async def list_episode_profiles():
     """
@@ -31,30 +87,14 @@ async def list_episode_profiles():
 
     返回系統中所有播客劇集配置的清單。
     """
-    try:
-        profiles = await EpisodeProfile.get_all(order_by="name asc")
-
-        return [
-            EpisodeProfileResponse(
-                id=str(profile.id),
-                name=profile.name,
-                description=profile.description or "",
-                speaker_config=profile.speaker_config,
-                outline_provider=profile.outline_provider,
-                outline_model=profile.outline_model,
-                transcript_provider=profile.transcript_provider,
-                transcript_model=profile.transcript_model,
-                default_briefing=profile.default_briefing,
-                num_segments=profile.num_segments,
-            )
-            for profile in profiles
-        ]
-
-    except Exception as e:
-        logger.error(f"Failed to fetch episode profiles: {e}")
-        raise HTTPException(
-            status_code=500, detail="Failed to fetch episode profiles"
-        )
+    cached = _profile_list_cache.get("profiles")
+    if cached is not None:
+        return cached
+    profiles = await EpisodeProfile.get_all(order_by="name asc")
+
+    response = [_to_response(profile) for profile in profiles]
+    _profile_list_cache["profiles"] = response
+    return response
 
 
 @router.get("/episode-profiles/{profile_name}", response_model=EpisodeProfileResponse)
@@ -66,35 +106,15 @@ async def get_episode_profile(profile_name: str):
 
     - **profile_name**: 劇集配置的名稱
     """
-    try:
-        profile = await EpisodeProfile.get_by_name(profile_name)
-
-        if not profile:
-            raise HTTPException(
-                status_code=404, detail=f"Episode profile '{profile_name}' not found"
-            )
-
-        return EpisodeProfileResponse(
-            id=str(profile.id),
-            name=profile.name,
-            description=profile.description or "",
-            speaker_config=profile.speaker_config,
-            outline_provider=profile.outline_provider,
-            outline_model=profile.outline_model,
-            transcript_provider=profile.transcript_provider,
-            transcript_model=profile.transcript_model,
-            default_briefing=profile.default_briefing,
-            num_segments=profile.num_segments,
-        )
+    profile = await EpisodeProfile.get_by_name(profile_name)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to fetch episode profile '{profile_name}': {e}")
+    if not profile:
         raise HTTPException(
-            status_code=500, detail="Failed to fetch episode profile"
+            status_code=404, detail=f"Episode profile '{profile_name}' not found"
         )
 
+    return _to_response(profile)
+
 
 class EpisodeProfileCreate(BaseModel):
     name: str = Field(..., description="Unique profile name")
@@ -127,39 +147,22 @@ async def create_episode_profile(profile_data: EpisodeProfileCreate):
     - **default_briefing**: 預設簡報模板
     - **num_segments**: 播客片段數量
     """
-    try:
-        profile = EpisodeProfile(
-            name=profile_data.name,
-            description=profile_data.description,
-            speaker_config=profile_data.speaker_config,
-            outline_provider=profile_data.outline_provider,
-            outline_model=profile_data.outline_model,
-            transcript_provider=profile_data.transcript_provider,
-            transcript_model=profile_data.transcript_model,
-            default_briefing=profile_data.default_briefing,
-            num_segments=profile_data.num_segments,
-        )
+    profile = EpisodeProfile(
+        name=profile_data.name,
+        description=profile_data.description,
+        speaker_config=profile_data.speaker_config,
+        outline_provider=profile_data.outline_provider,
+        outline_model=profile_data.outline_model,
+        transcript_provider=profile_data.transcript_provider,
+        transcript_model=profile_data.transcript_model,
+        default_briefing=profile_data.default_briefing,
+        num_segments=profile_data.num_segments,
+    )
 
-        await profile.save()
-
-        return EpisodeProfileResponse(
-            id=str(profile.id),
-            name=profile.name,
-            description=profile.description or "",
-            speaker_config=profile.speaker_config,
-            outline_provider=profile.outline_provider,
-            outline_model=profile.outline_model,
-            transcript_provider=profile.transcript_provider,
-            transcript_model=profile.transcript_model,
-            default_briefing=profile.default_briefing,
-            num_segments=profile.num_segments,
-        )
+    await profile.save()
+    _clear_profile_caches()
 
-    except Exception as e:
-        logger.error(f"Failed to create episode profile: {e}")
-        raise HTTPException(
-            status_code=500, detail="Failed to create episode profile"
-        )
+    return _to_response(profile)
 
 
 @router.put("/episode-profiles/{profile_id}", response_model=EpisodeProfileResponse)
@@ -180,47 +183,29 @@ async def update_episode_profile(profile_id: str, profile_data: EpisodeProfileCr
     - **default_briefing**: 新的預設簡報模板
     - **num_segments**: 新的片段數量
     """
-    try:
-        profile = await EpisodeProfile.get(profile_id)
-
-        if not profile:
-            raise HTTPException(
-                status_code=404, detail=f"Episode profile '{profile_id}' not found"
-            )
-
-        # Update fields
-        profile.name = profile_data.name
-        profile.description = profile_data.description
-        profile.speaker_config = profile_data.speaker_config
-        profile.outline_provider = profile_data.outline_provider
-        profile.outline_model = profile_data.outline_model
-        profile.transcript_provider = profile_data.transcript_provider
-        profile.transcript_model = profile_data.transcript_model
-        profile.default_briefing = profile_data.default_briefing
-        profile.num_segments = profile_data.num_segments
-
-        await profile.save()
-
-        return EpisodeProfileResponse(
-            id=str(profile.id),
-            name=profile.name,
-            description=profile.description or "",
-            speaker_config=profile.speaker_config,
-            outline_provider=profile.outline_provider,
-            outline_model=profile.outline_model,
-            transcript_provider=profile.transcript_provider,
-            transcript_model=profile.transcript_model,
-            default_briefing=profile.default_briefing,
-            num_segments=profile.num_segments,
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update episode profile: {e}")
+    record_id = _profile_record_id(profile_id)
+    # Validate against the domain model before writing
+    EpisodeProfile(**profile_data.model_dump())
+
+    # Single UPDATE; a missing record yields no rows instead of a prior read
+    result = await repo_query(
+        "UPDATE $id MERGE $data RETURN AFTER",
+        {
+            "id": record_id,
+            "data": {
+                **profile_data.model_dump(),
+                "updated": datetime.now(timezone.utc),
+            },
+        },
+    )
+    if not result:
         raise HTTPException(
-            status_code=500, detail="Failed to update episode profile"
+            status_code=404, detail=f"Episode profile '{profile_id}' not found"
         )
+    profile = EpisodeProfile(**result[0])
+    _clear_profile_caches()
+
+    return _to_response(profile)
 
 
 @router.delete("/episode-profiles/{profile_id}")
@@ -232,25 +217,18 @@ async def delete_episode_profile(profile_id: str):
 
     - **profile_id**: 要刪除的劇集配置 ID
     """
-    try:
-        profile = await EpisodeProfile.get(profile_id)
-
-        if not profile:
-            raise HTTPException(
-                status_code=404, detail=f"Episode profile '{profile_id}' not found"
-            )
-
-        await profile.delete()
-
-        return {"message": "Episode profile deleted successfully"}
+    # DELETE ... RETURN BEFORE is empty when nothing was deleted
+    deleted = await repo_query(
+        "DELETE $id RETURN BEFORE", {"id": _profile_record_id(profile_id)}
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete episode profile: {e}")
+    if not deleted:
         raise HTTPException(
-            status_code=500, detail="Failed to delete episode profile"
+            status_code=404, detail=f"Episode profile '{profile_id}' not found"
         )
+    _clear_profile_caches()
+
+    return {"message": "Episode profile deleted successfully"}
 
 
 @router.post(
@@ -264,46 +242,16 @@ async def duplicate_episode_profile(profile_id: str):
 
     - **profile_id**: 要複製的劇集配置 ID
     """
-    try:
-        original = await EpisodeProfile.get(profile_id)
-
-        if not original:
-            raise HTTPException(
-                status_code=404, detail=f"Episode profile '{profile_id}' not found"
-            )
-
-        # Create duplicate with modified name
-        duplicate = EpisodeProfile(
-            name=f"{original.name} - Copy",
-            description=original.description,
-            speaker_config=original.speaker_config,
-            outline_provider=original.outline_provider,
-            outline_model=original.outline_model,
-            transcript_provider=original.transcript_provider,
-            transcript_model=original.transcript_model,
-            default_briefing=original.default_briefing,
-            num_segments=original.num_segments,
-        )
-
-        await duplicate.save()
-
-        return EpisodeProfileResponse(
-            id=str(duplicate.id),
-            name=duplicate.name,
-            description=duplicate.description or "",
-            speaker_config=duplicate.speaker_config,
-            outline_provider=duplicate.outline_provider,
-            outline_model=duplicate.outline_model,
-            transcript_provider=duplicate.transcript_provider,
-            transcript_model=duplicate.transcript_model,
-            default_briefing=duplicate.default_briefing,
-            num_segments=duplicate.num_segments,
-        )
+    # Copy the record server-side; a missing source inserts nothing
+    result = await repo_query(
+        DUPLICATE_PROFILE_QUERY, {"id": _profile_record_id(profile_id)}
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to duplicate episode profile: {e}")
+    if not result:
         raise HTTPException(
-            status_code=500, detail="Failed to duplicate episode profile"
+            status_code=404, detail=f"Episode profile '{profile_id}' not found"
         )
+    _clear_profile_caches()
+
+    # The copy comes from a row the model validated when it was saved
+    return _to_response(EpisodeProfile.model_construct(**result[0]))
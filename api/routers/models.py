@@ -209,8 +209,6 @@ async def update_default_models(defaults_data: DefaultModelsResponse):
 
         await defaults.update()
 
-        # No cache refresh needed - next access will fetch fresh data from DB
-
         return DefaultModelsResponse(
             default_chat_model=defaults.default_chat_model,  # type: ignore[attr-defined]
             default_transformation_model=defaults.default_transformation_model,  # type: ignore[attr-defined]
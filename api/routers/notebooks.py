@@ -1,7 +1,9 @@
+import asyncio
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
-from loguru import logger
+from surrealdb import RecordID  # type: ignore
 
 from api.models import (
     NotebookCreate,
@@ -10,87 +12,165 @@ from api.models import (
     NotebookResponse,
     NotebookUpdate,
 )
+from api.responses import OrjsonResponse
 from open_notebook.database.repository import ensure_record_id, repo_query
 from open_notebook.domain.notebook import Notebook, Source
-from open_notebook.exceptions import InvalidInputError
 
 router = APIRouter()
 
+# Only the columns NotebookResponse needs are read, never SELECT *
+NOTEBOOK_FIELDS = (
+    "id, name, description, archived, created, updated, "
+    "custom_system_prompt, active_prompt_id"
+)
+NOTEBOOK_COUNT_FIELDS = (
+    "count(<-reference.in) as source_count, count(<-artifact.in) as note_count"
+)
+
+NOTEBOOK_UPDATE_QUERY = (
+    "UPDATE $notebook_id MERGE $patch "
+    f"RETURN {NOTEBOOK_FIELDS}, {NOTEBOOK_COUNT_FIELDS}"
+)
+NOTEBOOK_GET_QUERY = (
+    f"SELECT {NOTEBOOK_FIELDS}, {NOTEBOOK_COUNT_FIELDS} FROM $notebook_id"
+)
+
 
-@router.get("/notebooks", response_model=List[NotebookResponse])
+# order_by is interpolated into SurrealQL, so only these values are accepted;
+# each combination maps to one fixed query string
+NOTEBOOK_ORDERINGS = (
+    "updated desc",
+    "updated asc",
+    "created desc",
+    "created asc",
+    "name asc",
+    "name desc",
+)
+NOTEBOOK_LIST_QUERIES = {
+    (order, filtered): (
+        f"SELECT {NOTEBOOK_FIELDS} FROM notebook"
+        + (" WHERE archived = $archived" if filtered else "")
+        + f" ORDER BY {order}"
+    )
+    for order in NOTEBOOK_ORDERINGS
+    for filtered in (False, True)
+}
+# Edge lookups by in/out rely on the idx_reference_* / idx_artifact_* indexes
+# (migration 11)
+NOTEBOOK_SOURCE_COUNTS_QUERY = (
+    "SELECT out AS notebook, count() AS count FROM reference GROUP BY notebook"
+)
+NOTEBOOK_NOTE_COUNTS_QUERY = (
+    "SELECT out AS notebook, count() AS count FROM artifact GROUP BY notebook"
+)
+
+# source->reference->notebook, so the source is "in" and the notebook "out"
+LINK_SOURCE_QUERY = """
+    IF array::len((
+        SELECT VALUE id FROM reference
+        WHERE in = $source_id AND out = $notebook_id LIMIT 1
+    )) = 0 {
+        RELATE $source_id->reference->$notebook_id;
+    };
+"""
+
+# Unlink in the same statement as the notebook existence check; yields
+# nothing when the notebook is missing (the edge delete itself is idempotent)
+UNLINK_SOURCE_QUERY = """
+    IF array::len((SELECT VALUE id FROM $notebook_id)) > 0 {
+        DELETE FROM reference WHERE out = $notebook_id AND in = $source_id;
+        RETURN [$notebook_id];
+    };
+"""
+
+
+def _notebook_record_id(notebook_id: str) -> RecordID:
+    """Parse a notebook ID, treating IDs from other tables as not found.
+
+    The single-statement writes below run on whatever record they are given,
+    so this keeps e.g. ``PUT /notebooks/source:x`` away from sources.
+    """
+    record_id = ensure_record_id(notebook_id)
+    if record_id.table_name != Notebook.table_name:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+    return record_id
+
+
+def _notebook_dict(nb: dict) -> dict:
+    """Shape a notebook row with counts like NotebookResponse."""
+    return {
+        "id": str(nb.get("id", "")),
+        "name": nb.get("name", ""),
+        "description": nb.get("description") or "",
+        "archived": nb.get("archived") or False,
+        "created": str(nb.get("created", "")),
+        "updated": str(nb.get("updated", "")),
+        "source_count": nb.get("source_count", 0),
+        "note_count": nb.get("note_count", 0),
+        "custom_system_prompt": nb.get("custom_system_prompt"),
+        "active_prompt_id": nb.get("active_prompt_id"),
+    }
+
+
+def _notebook_response(nb: dict) -> NotebookResponse:
+    """Build a NotebookResponse from a notebook row with counts."""
+    return NotebookResponse(**_notebook_dict(nb))
+
+
+@router.get("/notebooks", responses={200: {"model": List[NotebookResponse]}})
 async def get_notebooks(
     archived: Optional[bool] = Query(None, description="Filter by archived status"),
     order_by: str = Query("updated desc", description="Order by field and direction"),
 ):
     """Get all notebooks with optional filtering and ordering."""
-    try:
-        # Build the query with counts
-        query = f"""
-            SELECT *,
-            count(<-reference.in) as source_count,
-            count(<-artifact.in) as note_count
-            FROM notebook
-            ORDER BY {order_by}
-        """
-
-        result = await repo_query(query)
-
-        # Filter by archived status if specified
-        if archived is not None:
-            result = [nb for nb in result if nb.get("archived") == archived]
-
-        return [
-            NotebookResponse(
-                id=str(nb.get("id", "")),
-                name=nb.get("name", ""),
-                description=nb.get("description", ""),
-                archived=nb.get("archived", False),
-                created=str(nb.get("created", "")),
-                updated=str(nb.get("updated", "")),
-                source_count=nb.get("source_count", 0),
-                note_count=nb.get("note_count", 0),
-                custom_system_prompt=nb.get("custom_system_prompt"),
-                active_prompt_id=nb.get("active_prompt_id"),
-            )
-            for nb in result
-        ]
-    except Exception as e:
-        logger.error(f"Error fetching notebooks: {str(e)}")
+    order = " ".join(order_by.lower().split())
+    if order not in NOTEBOOK_ORDERINGS:
         raise HTTPException(
-            status_code=500, detail=f"Error fetching notebooks: {str(e)}"
+            status_code=400,
+            detail=f"Invalid order_by; expected one of: {', '.join(NOTEBOOK_ORDERINGS)}",
         )
+    query = NOTEBOOK_LIST_QUERIES[(order, archived is not None)]
+
+    # Notebooks and per-notebook edge counts are fetched in parallel and
+    # joined here, instead of two count subqueries per notebook row
+    result, source_counts, note_counts = await asyncio.gather(
+        repo_query(query, {"archived": archived}),
+        repo_query(NOTEBOOK_SOURCE_COUNTS_QUERY),
+        repo_query(NOTEBOOK_NOTE_COUNTS_QUERY),
+    )
+    sources_by_notebook = {row["notebook"]: row["count"] for row in source_counts}
+    notes_by_notebook = {row["notebook"]: row["count"] for row in note_counts}
+    for nb in result:
+        nb["source_count"] = sources_by_notebook.get(nb["id"], 0)
+        nb["note_count"] = notes_by_notebook.get(nb["id"], 0)
+
+    # The list can be long; skip per-row model validation and let
+    # orjson serialize the plain dicts
+    return OrjsonResponse([_notebook_dict(nb) for nb in result])
 
 
 @router.post("/notebooks", response_model=NotebookResponse)
 async def create_notebook(notebook: NotebookCreate):
     """Create a new notebook."""
-    try:
-        new_notebook = Notebook(
-            name=notebook.name,
-            description=notebook.description,
-            custom_system_prompt=notebook.custom_system_prompt,
-        )
-        await new_notebook.save()
-
-        return NotebookResponse(
-            id=new_notebook.id or "",
-            name=new_notebook.name,
-            description=new_notebook.description,
-            archived=new_notebook.archived or False,
-            created=str(new_notebook.created),
-            updated=str(new_notebook.updated),
-            source_count=0,  # New notebook has no sources
-            note_count=0,  # New notebook has no notes
-            custom_system_prompt=new_notebook.custom_system_prompt,
-            active_prompt_id=new_notebook.active_prompt_id,
-        )
-    except InvalidInputError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error creating notebook: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error creating notebook: {str(e)}"
-        )
+    new_notebook = Notebook(
+        name=notebook.name,
+        description=notebook.description,
+        custom_system_prompt=notebook.custom_system_prompt,
+    )
+    await new_notebook.save()
+
+    return NotebookResponse(
+        id=new_notebook.id or "",
+        name=new_notebook.name,
+        description=new_notebook.description,
+        archived=new_notebook.archived or False,
+        created=str(new_notebook.created),
+        updated=str(new_notebook.updated),
+        source_count=0,  # New notebook has no sources
+        note_count=0,  # New notebook has no notes
+        custom_system_prompt=new_notebook.custom_system_prompt,
+        active_prompt_id=new_notebook.active_prompt_id,
+    )
 
 
 @router.get(
@@ -98,211 +178,100 @@ async def create_notebook(notebook: NotebookCreate):
 )
 async def get_notebook_delete_preview(notebook_id: str):
     """Get a preview of what will be deleted when this notebook is deleted."""
-    try:
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        preview = await notebook.get_delete_preview()
-
-        return NotebookDeletePreview(
-            notebook_id=str(notebook.id),
-            notebook_name=notebook.name,
-            note_count=preview["note_count"],
-            exclusive_source_count=preview["exclusive_source_count"],
-            shared_source_count=preview["shared_source_count"],
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting delete preview for notebook {notebook_id}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching notebook deletion preview: {str(e)}",
-        )
+    notebook = await Notebook.get(notebook_id)
+    if not notebook:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+    preview = await notebook.get_delete_preview()
+
+    return NotebookDeletePreview(
+        notebook_id=str(notebook.id),
+        notebook_name=notebook.name,
+        note_count=preview["note_count"],
+        exclusive_source_count=preview["exclusive_source_count"],
+        shared_source_count=preview["shared_source_count"],
+    )
 
 
 @router.get("/notebooks/{notebook_id}", response_model=NotebookResponse)
 async def get_notebook(notebook_id: str):
     """Get a specific notebook by ID."""
-    try:
-        # Query with counts for single notebook
-        query = """
-            SELECT *,
-            count(<-reference.in) as source_count,
-            count(<-artifact.in) as note_count
-            FROM $notebook_id
-        """
-        result = await repo_query(query, {"notebook_id": ensure_record_id(notebook_id)})
-
-        if not result:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        nb = result[0]
-        return NotebookResponse(
-            id=str(nb.get("id", "")),
-            name=nb.get("name", ""),
-            description=nb.get("description", ""),
-            archived=nb.get("archived", False),
-            created=str(nb.get("created", "")),
-            updated=str(nb.get("updated", "")),
-            source_count=nb.get("source_count", 0),
-            note_count=nb.get("note_count", 0),
-            custom_system_prompt=nb.get("custom_system_prompt"),
-            active_prompt_id=nb.get("active_prompt_id"),
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching notebook {notebook_id}: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error fetching notebook: {str(e)}"
-        )
+    # Query with counts for single notebook
+    result = await repo_query(
+        NOTEBOOK_GET_QUERY, {"notebook_id": ensure_record_id(notebook_id)}
+    )
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+    return _notebook_response(result[0])
 
 
 @router.put("/notebooks/{notebook_id}", response_model=NotebookResponse)
 async def update_notebook(notebook_id: str, notebook_update: NotebookUpdate):
     """Update a notebook."""
-    try:
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        # Update only provided fields, allowing explicit null values
-        update_data = notebook_update.model_dump(exclude_unset=True)
-
-        if "name" in update_data:
-            notebook.name = update_data["name"]
-        if "description" in update_data:
-            notebook.description = update_data["description"]
-        if "archived" in update_data:
-            notebook.archived = update_data["archived"]
-        if "custom_system_prompt" in update_data:
-            notebook.custom_system_prompt = update_data["custom_system_prompt"]
-
-        await notebook.save()
-
-        # Query with counts after update
-        query = """
-            SELECT *,
-            count(<-reference.in) as source_count,
-            count(<-artifact.in) as note_count
-            FROM $notebook_id
-        """
-        result = await repo_query(query, {"notebook_id": ensure_record_id(notebook_id)})
-
-        if result:
-            nb = result[0]
-            return NotebookResponse(
-                    id=str(nb.get("id", "")),
-                    name=nb.get("name", ""),
-                    description=nb.get("description", ""),
-                    archived=nb.get("archived", False),
-                    created=str(nb.get("created", "")),
-                    updated=str(nb.get("updated", "")),
-                    source_count=nb.get("source_count", 0),
-                    note_count=nb.get("note_count", 0),
-                    custom_system_prompt=nb.get("custom_system_prompt"),
-                    active_prompt_id=nb.get("active_prompt_id"),
-                )
-
-        # Fallback if query fails
-        return NotebookResponse(
-            id=notebook.id or "",
-            name=notebook.name,
-            description=notebook.description,
-            archived=notebook.archived or False,
-            created=str(notebook.created),
-            updated=str(notebook.updated),
-            source_count=0,
-            note_count=0,
-            custom_system_prompt=notebook.custom_system_prompt,
-            active_prompt_id=notebook.active_prompt_id,
-        )
-    except HTTPException:
-        raise
-    except InvalidInputError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error updating notebook {notebook_id}: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error updating notebook: {str(e)}"
-        )
+    # Update only provided fields, allowing explicit null values where the
+    # model permits them (same rule as ObjectModel.save)
+    notebook_rid = _notebook_record_id(notebook_id)
+    update_data = notebook_update.model_dump(exclude_unset=True)
+    patch = {
+        key: value
+        for key, value in update_data.items()
+        if value is not None or key in Notebook.nullable_fields
+    }
+    if "name" in patch:
+        Notebook.name_must_not_be_empty(patch["name"])
+    patch["updated"] = datetime.now(timezone.utc)
+
+    # Update and read back the counts in one round-trip; UPDATE on a
+    # missing record returns nothing
+    result = await repo_query(
+        NOTEBOOK_UPDATE_QUERY,
+        {"notebook_id": notebook_rid, "patch": patch},
+    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+    return _notebook_response(result[0])
 
 
 @router.post("/notebooks/{notebook_id}/sources/{source_id}")
 async def add_source_to_notebook(notebook_id: str, source_id: str):
     """Add an existing source to a notebook (create the reference)."""
-    try:
-        # Check if notebook exists
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        # Check if source exists
-        source = await Source.get(source_id)
-        if not source:
-            raise HTTPException(status_code=404, detail="Source not found")
-
-        # Check if reference already exists (idempotency)
-        existing_ref = await repo_query(
-            "SELECT * FROM reference WHERE out = $source_id AND in = $notebook_id",
-            {
-                "notebook_id": ensure_record_id(notebook_id),
-                "source_id": ensure_record_id(source_id),
-            },
-        )
+    nb_rid = ensure_record_id(notebook_id)
+    src_rid = ensure_record_id(source_id)
 
-        # If reference doesn't exist, create it
-        if not existing_ref:
-            await repo_query(
-                "RELATE $source_id->reference->$notebook_id",
-                {
-                    "notebook_id": ensure_record_id(notebook_id),
-                    "source_id": ensure_record_id(source_id),
-                },
-            )
-
-        return {"message": "Source linked to notebook successfully"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(
-            f"Error linking source {source_id} to notebook {notebook_id}: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=500, detail=f"Error linking source to notebook: {str(e)}"
-        )
+    # Both records must exist; fetch them concurrently
+    notebook, source = await asyncio.gather(
+        Notebook.get(notebook_id), Source.get(source_id)
+    )
+    if not notebook:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+
+    # Existence check and RELATE run as one statement (idempotent)
+    await repo_query(LINK_SOURCE_QUERY, {"notebook_id": nb_rid, "source_id": src_rid})
+
+    return {"message": "Source linked to notebook successfully"}
 
 
 @router.delete("/notebooks/{notebook_id}/sources/{source_id}")
 async def remove_source_from_notebook(notebook_id: str, source_id: str):
     """Remove a source from a notebook (delete the reference)."""
-    try:
-        # Check if notebook exists
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        # Delete the reference record linking source to notebook
-        await repo_query(
-            "DELETE FROM reference WHERE out = $notebook_id AND in = $source_id",
-            {
-                "notebook_id": ensure_record_id(notebook_id),
-                "source_id": ensure_record_id(source_id),
-            },
-        )
+    nb_rid = _notebook_record_id(notebook_id)
+    src_rid = ensure_record_id(source_id)
+    # The edge delete only matches on the IDs, so check the source's table too
+    if src_rid.table_name != Source.table_name:
+        raise HTTPException(status_code=404, detail="Source not found")
 
-        return {"message": "Source removed from notebook successfully"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(
-            f"Error removing source {source_id} from notebook {notebook_id}: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=500, detail=f"Error removing source from notebook: {str(e)}"
-        )
+    result = await repo_query(
+        UNLINK_SOURCE_QUERY, {"notebook_id": nb_rid, "source_id": src_rid}
+    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+    return {"message": "Source removed from notebook successfully"}
 
 
 @router.delete("/notebooks/{notebook_id}", response_model=NotebookDeleteResponse)
@@ -320,23 +289,18 @@ async def delete_notebook(
     If delete_exclusive_sources is True, also deletes sources that belong only
     to this notebook (not linked to any other notebooks).
     """
-    try:
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        result = await notebook.delete(delete_exclusive_sources=delete_exclusive_sources)
-
-        return NotebookDeleteResponse(
-            message="Notebook deleted successfully",
-            deleted_notes=result["deleted_notes"],
-            deleted_sources=result["deleted_sources"],
-            unlinked_sources=result["unlinked_sources"],
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting notebook {notebook_id}: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error deleting notebook: {str(e)}"
-        )
+    # The cascade walks the notebook's note and source edges before removing
+    # the record, so it can't start with a single DELETE ... RETURN BEFORE
+    _notebook_record_id(notebook_id)
+    notebook = await Notebook.get(notebook_id)
+    if not notebook:
+        raise HTTPException(status_code=404, detail="Notebook not found")
+
+    result = await notebook.delete(delete_exclusive_sources=delete_exclusive_sources)
+
+    return NotebookDeleteResponse(
+        message="Notebook deleted successfully",
+        deleted_notes=result["deleted_notes"],
+        deleted_sources=result["deleted_sources"],
+        unlinked_sources=result["unlinked_sources"],
+    )
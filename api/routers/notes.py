@@ -1,187 +1,251 @@
+import asyncio
+import hashlib
+import re
 from typing import List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from cachetools import LRUCache
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from loguru import logger
 
 from api.models import NoteCreate, NoteResponse, NoteUpdate
-from open_notebook.domain.notebook import Note
-from open_notebook.exceptions import InvalidInputError
+from api.responses import OrjsonResponse, etag_matches
+from open_notebook.database.repository import ensure_record_id, repo_query
+from open_notebook.domain.notebook import Note, Notebook
+from open_notebook.exceptions import NotFoundError
+from open_notebook.graphs.prompt import graph as prompt_graph
 
 router = APIRouter()
 
+NOTE_TITLE_PROMPT = "Based on the Note below, please provide a Title for this content, with max 15 words"
+PROVISIONAL_TITLE_MAX_CHARS = 80
+_FIRST_SENTENCE = re.compile(r"[^.!?。！？\n]+")
 
-@router.get("/notes", response_model=List[NoteResponse])
-async def get_notes(
-    notebook_id: Optional[str] = Query(None, description="Filter by notebook ID"),
-):
+# Generated titles by content digest, so identical AI notes skip the LLM call
+_note_title_cache: LRUCache = LRUCache(maxsize=1024)
+
+
+def _provisional_title(content: str) -> str:
+    """First sentence of the content, used until the generated title lands."""
+    match = _FIRST_SENTENCE.search(content.strip().lstrip("#").strip())
+    if not match:
+        return "Untitled Note"
+    return match.group().strip()[:PROVISIONAL_TITLE_MAX_CHARS].rstrip()
+
+
+async def _request_note_title(content: str, content_key: bytes) -> Optional[str]:
+    """Ask the LLM for a note title, caching it by content digest."""
+    result = await prompt_graph.ainvoke(
+        {  # type: ignore[arg-type]
+            "input_text": content,
+            "prompt": NOTE_TITLE_PROMPT,
+        }
+    )
+    title = result.get("output")
+    if title:
+        _note_title_cache[content_key] = title
+    return title
+
+
+async def _generate_note_title(
+    note_id: str, content: str, content_key: bytes, provisional: str
+) -> None:
+    """Replace a provisional AI-note title with an LLM-generated one."""
+    try:
+        title = await _request_note_title(content, content_key)
+        if not title:
+            return
+        # Leave the title alone if it was edited in the meantime
+        await repo_query(
+            "UPDATE $id SET title = $title WHERE title = $provisional",
+            {
+                "id": ensure_record_id(note_id),
+                "title": title,
+                "provisional": provisional,
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Failed to generate title for note {note_id}: {e}")
+
+
+def _note_item(note: Note) -> dict:
+    """Shape a note like NoteResponse; called by orjson per item."""
+    return {
+        "id": note.id or "",
+        "title": note.title,
+        "content": note.content,
+        "note_type": note.note_type,
+        "created": str(note.created),
+        "updated": str(note.updated),
+    }
+
+
+# Read straight from the query string; documented here for the OpenAPI schema
+NOTEBOOK_ID_QUERY_PARAM = {
+    "name": "notebook_id",
+    "in": "query",
+    "required": False,
+    "schema": {"type": "string"},
+    "description": "Filter by notebook ID",
+}
+
+
+@router.get(
+    "/notes",
+    responses={200: {"model": List[NoteResponse]}},
+    openapi_extra={"parameters": [NOTEBOOK_ID_QUERY_PARAM]},
+)
+async def get_notes(request: Request):
     """Get all notes with optional notebook filtering."""
+    notebook_id = request.query_params.get("notebook_id")
     try:
         if notebook_id:
-            # Get notes for a specific notebook
-            from open_notebook.domain.notebook import Notebook
-
-            notebook = await Notebook.get(notebook_id)
-            if not notebook:
-                raise HTTPException(status_code=404, detail="Notebook not found")
-            notes = await notebook.get_notes()
+            # Notebook check and notes fetch share one round-trip
+            notes = await Note.get_for_notebook(notebook_id)
         else:
             # Get all notes
             notes = await Note.get_all(order_by="updated desc")
 
-        return [
-            NoteResponse(
-                id=note.id or "",
-                title=note.title,
-                content=note.content,
-                note_type=note.note_type,
-                created=str(note.created),
-                updated=str(note.updated),
-            )
-            for note in notes
-        ]
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching notes: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching notes: {str(e)}")
+        # Notes were validated by the domain model on load; skip response
+        # validation and shape each item as orjson reaches it
+        return OrjsonResponse(notes, default=_note_item)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Notebook not found")
 
 
 @router.post("/notes", response_model=NoteResponse)
-async def create_note(note_data: NoteCreate):
-    """Create a new note."""
-    try:
-        # Auto-generate title if not provided and it's an AI note
-        title = note_data.title
-        if not title and note_data.note_type == "ai" and note_data.content:
-            from open_notebook.graphs.prompt import graph as prompt_graph
-
-            prompt = "Based on the Note below, please provide a Title for this content, with max 15 words"
-            result = await prompt_graph.ainvoke(
-                {  # type: ignore[arg-type]
-                    "input_text": note_data.content,
-                    "prompt": prompt,
-                }
-            )
-            title = result.get("output", "Untitled Note")
-
-        # Validate note_type
-        note_type: Optional[Literal["human", "ai"]] = None
-        if note_data.note_type in ("human", "ai"):
-            note_type = note_data.note_type  # type: ignore[assignment]
-        elif note_data.note_type is not None:
-            raise HTTPException(
-                status_code=400, detail="note_type must be 'human' or 'ai'"
-            )
-
-        new_note = Note(
-            title=title,
-            content=note_data.content,
-            note_type=note_type,
+async def create_note(
+    note_data: NoteCreate,
+    background_tasks: BackgroundTasks,
+    wait_for_title: bool = Query(
+        False, description="Generate the AI note title before responding"
+    ),
+):
+    """Create a new note.
+
+    An AI note saved without a title is returned with its first sentence as
+    a provisional title; the generated title replaces it shortly after the
+    response is sent, unless the title was edited first. Pass
+    ``wait_for_title=true`` to get the generated title in the response.
+    """
+    title = note_data.title
+    generate_title = False
+    if not title and note_data.note_type == "ai" and note_data.content:
+        content_key = hashlib.blake2s(note_data.content.encode()).digest()
+        title = _note_title_cache.get(content_key)
+        if title is None and wait_for_title:
+            title = await _request_note_title(note_data.content, content_key)
+        if title is None:
+            title = _provisional_title(note_data.content)
+            generate_title = not wait_for_title
+
+    # Validate note_type
+    note_type: Optional[Literal["human", "ai"]] = None
+    if note_data.note_type in ("human", "ai"):
+        note_type = note_data.note_type  # type: ignore[assignment]
+    elif note_data.note_type is not None:
+        raise HTTPException(status_code=400, detail="note_type must be 'human' or 'ai'")
+
+    new_note = Note(
+        title=title,
+        content=note_data.content,
+        note_type=note_type,
+    )
+    if note_data.notebook_id:
+        # The notebook check doesn't depend on the save, so overlap them
+        _, notebook_exists = await asyncio.gather(
+            new_note.save(), Notebook.exists(note_data.notebook_id)
         )
+        if not notebook_exists:
+            raise HTTPException(status_code=404, detail="Notebook not found")
+        await new_note.add_to_notebook(note_data.notebook_id)
+    else:
         await new_note.save()
 
-        # Add to notebook if specified
-        if note_data.notebook_id:
-            from open_notebook.domain.notebook import Notebook
-
-            notebook = await Notebook.get(note_data.notebook_id)
-            if not notebook:
-                raise HTTPException(status_code=404, detail="Notebook not found")
-            await new_note.add_to_notebook(note_data.notebook_id)
-
-        return NoteResponse(
-            id=new_note.id or "",
-            title=new_note.title,
-            content=new_note.content,
-            note_type=new_note.note_type,
-            created=str(new_note.created),
-            updated=str(new_note.updated),
+    if generate_title and new_note.id and note_data.content:
+        background_tasks.add_task(
+            _generate_note_title, new_note.id, note_data.content, content_key, title
         )
-    except HTTPException:
-        raise
-    except InvalidInputError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error creating note: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error creating note: {str(e)}")
+
+    return NoteResponse(
+        id=new_note.id or "",
+        title=new_note.title,
+        content=new_note.content,
+        note_type=new_note.note_type,
+        created=str(new_note.created),
+        updated=str(new_note.updated),
+    )
 
 
 @router.get("/notes/{note_id}", response_model=NoteResponse)
-async def get_note(note_id: str):
+async def get_note(note_id: str, request: Request, response: Response):
     """Get a specific note by ID."""
-    try:
-        note = await Note.get(note_id)
-        if not note:
-            raise HTTPException(status_code=404, detail="Note not found")
-
-        return NoteResponse(
-            id=note.id or "",
-            title=note.title,
-            content=note.content,
-            note_type=note.note_type,
-            created=str(note.created),
-            updated=str(note.updated),
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching note {note_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching note: {str(e)}")
+    note = await Note.get(note_id)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+
+    # Every save bumps updated, so it identifies the note's version
+    if note.updated:
+        etag = f'W/"{note.updated.isoformat()}"'
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return NoteResponse(
+        id=note.id or "",
+        title=note.title,
+        content=note.content,
+        note_type=note.note_type,
+        created=str(note.created),
+        updated=str(note.updated),
+    )
 
 
 @router.put("/notes/{note_id}", response_model=NoteResponse)
 async def update_note(note_id: str, note_update: NoteUpdate):
     """Update a note."""
-    try:
-        note = await Note.get(note_id)
-        if not note:
-            raise HTTPException(status_code=404, detail="Note not found")
-
-        # Update only provided fields
-        if note_update.title is not None:
-            note.title = note_update.title
-        if note_update.content is not None:
-            note.content = note_update.content
-        if note_update.note_type is not None:
-            if note_update.note_type in ("human", "ai"):
-                note.note_type = note_update.note_type  # type: ignore[assignment]
-            else:
-                raise HTTPException(
-                    status_code=400, detail="note_type must be 'human' or 'ai'"
-                )
-
-        await note.save()
-
-        return NoteResponse(
-            id=note.id or "",
-            title=note.title,
-            content=note.content,
-            note_type=note.note_type,
-            created=str(note.created),
-            updated=str(note.updated),
-        )
-    except HTTPException:
-        raise
-    except InvalidInputError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error updating note {note_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error updating note: {str(e)}")
+    note = await Note.get(note_id)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+
+    # Update only provided fields
+    if note_update.title is not None:
+        note.title = note_update.title
+    if note_update.content is not None:
+        note.content = note_update.content
+    if note_update.note_type is not None:
+        if note_update.note_type in ("human", "ai"):
+            note.note_type = note_update.note_type  # type: ignore[assignment]
+        else:
+            raise HTTPException(
+                status_code=400, detail="note_type must be 'human' or 'ai'"
+            )
+
+    await note.save()
+
+    return NoteResponse(
+        id=note.id or "",
+        title=note.title,
+        content=note.content,
+        note_type=note.note_type,
+        created=str(note.created),
+        updated=str(note.updated),
+    )
 
 
 @router.delete("/notes/{note_id}")
 async def delete_note(note_id: str):
     """Delete a note."""
-    try:
-        note = await Note.get(note_id)
-        if not note:
-            raise HTTPException(status_code=404, detail="Note not found")
+    note = await Note.get(note_id)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
 
-        await note.delete()
+    await note.delete()
 
-        return {"message": "Note deleted successfully"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting note {note_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error deleting note: {str(e)}")
+    return {"message": "Note deleted successfully"}
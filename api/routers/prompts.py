@@ -4,11 +4,23 @@ from fastapi import APIRouter, HTTPException
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from api.responses import OrjsonResponse
 from open_notebook.domain.notebook import Notebook, SystemPrompt
 from open_notebook.exceptions import NotFoundError
 
 router = APIRouter()
 
+PROMPT_ID_PREFIX = "system_prompt:"
+
+
+def _full_prompt_id(prompt_id: str) -> str:
+    """Accept prompt IDs with or without the table prefix."""
+    return (
+        prompt_id
+        if prompt_id.startswith(PROMPT_ID_PREFIX)
+        else PROMPT_ID_PREFIX + prompt_id
+    )
+
 
 # Request/Response models
 class CreatePromptRequest(BaseModel):
@@ -34,7 +46,21 @@ class SetActivePromptRequest(BaseModel):
     prompt_id: Optional[str] = Field(None, description="Prompt ID (null to unset)")
 
 
-@router.get("/notebooks/{notebook_id}/prompts", response_model=List[PromptResponse])
+def _prompt_item(prompt: SystemPrompt) -> dict:
+    """Shape a prompt like PromptResponse; called by orjson per item."""
+    return {
+        "id": prompt.id or "",
+        "name": prompt.name,
+        "content": prompt.content,
+        "created": str(prompt.created),
+        "updated": str(prompt.updated),
+    }
+
+
+@router.get(
+    "/notebooks/{notebook_id}/prompts",
+    responses={200: {"model": List[PromptResponse]}},
+)
 async def get_notebook_prompts(notebook_id: str):
     """
     Get all prompts for a notebook.
@@ -44,29 +70,14 @@ async def get_notebook_prompts(notebook_id: str):
     - **notebook_id**: 筆記本 ID
     """
     try:
-        # Verify notebook exists
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
+        # Raises NotFoundError for a missing notebook; no separate lookup
+        prompts = await Notebook.get_prompts_by_id(notebook_id)
 
-        # Get all prompts
-        prompts = await notebook.get_prompts()
-
-        return [
-            PromptResponse(
-                id=prompt.id or "",
-                name=prompt.name,
-                content=prompt.content,
-                created=str(prompt.created),
-                updated=str(prompt.updated),
-            )
-            for prompt in prompts
-        ]
+        # Prompts were validated by the domain model on load; skip response
+        # validation and shape each item as orjson reaches it
+        return OrjsonResponse(prompts, default=_prompt_item)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Notebook not found")
-    except Exception as e:
-        logger.error(f"Error fetching prompts: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching prompts: {str(e)}")
 
 
 @router.post("/notebooks/{notebook_id}/prompts", response_model=PromptResponse)
@@ -81,9 +92,8 @@ async def create_prompt(notebook_id: str, request: CreatePromptRequest):
     - **content**: Prompt 內容
     """
     try:
-        # Verify notebook exists
-        notebook = await Notebook.get(request.notebook_id)
-        if not notebook:
+        # Verify notebook exists (recent hits are answered from memory)
+        if not await Notebook.exists(request.notebook_id):
             raise HTTPException(status_code=404, detail="Notebook not found")
 
         # Create prompt
@@ -102,9 +112,6 @@ async def create_prompt(notebook_id: str, request: CreatePromptRequest):
         )
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Notebook not found")
-    except Exception as e:
-        logger.error(f"Error creating prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error creating prompt: {str(e)}")
 
 
 @router.get("/prompts/{prompt_id}", response_model=PromptResponse)
@@ -118,11 +125,7 @@ async def get_prompt(prompt_id: str):
     """
     try:
         # Ensure prompt_id has proper table prefix
-        full_prompt_id = (
-            prompt_id
-            if prompt_id.startswith("system_prompt:")
-            else f"system_prompt:{prompt_id}"
-        )
+        full_prompt_id = _full_prompt_id(prompt_id)
         prompt = await SystemPrompt.get(full_prompt_id)
         if not prompt:
             raise HTTPException(status_code=404, detail="Prompt not found")
@@ -136,9 +139,6 @@ async def get_prompt(prompt_id: str):
         )
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    except Exception as e:
-        logger.error(f"Error fetching prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching prompt: {str(e)}")
 
 
 @router.put("/prompts/{prompt_id}", response_model=PromptResponse)
@@ -154,21 +154,17 @@ async def update_prompt(prompt_id: str, request: UpdatePromptRequest):
     """
     try:
         # Ensure prompt_id has proper table prefix
-        full_prompt_id = (
-            prompt_id
-            if prompt_id.startswith("system_prompt:")
-            else f"system_prompt:{prompt_id}"
-        )
+        full_prompt_id = _full_prompt_id(prompt_id)
         prompt = await SystemPrompt.get(full_prompt_id)
         if not prompt:
             raise HTTPException(status_code=404, detail="Prompt not found")
 
-        # Update fields
-        update_data = request.model_dump(exclude_unset=True)
-        if "name" in update_data:
-            prompt.name = update_data["name"]
-        if "content" in update_data:
-            prompt.content = update_data["content"]
+        # Update only the fields the client sent; name and content are
+        # required on the prompt, so an explicit null leaves them unchanged
+        for field in request.model_fields_set:
+            value = getattr(request, field)
+            if value is not None:
+                setattr(prompt, field, value)
 
         await prompt.save()
 
@@ -181,9 +177,6 @@ async def update_prompt(prompt_id: str, request: UpdatePromptRequest):
         )
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    except Exception as e:
-        logger.error(f"Error updating prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error updating prompt: {str(e)}")
 
 
 @router.delete("/prompts/{prompt_id}")
@@ -197,11 +190,7 @@ async def delete_prompt(prompt_id: str):
     """
     try:
         # Ensure prompt_id has proper table prefix
-        full_prompt_id = (
-            prompt_id
-            if prompt_id.startswith("system_prompt:")
-            else f"system_prompt:{prompt_id}"
-        )
+        full_prompt_id = _full_prompt_id(prompt_id)
         prompt = await SystemPrompt.get(full_prompt_id)
         if not prompt:
             raise HTTPException(status_code=404, detail="Prompt not found")
@@ -211,9 +200,6 @@ async def delete_prompt(prompt_id: str):
         return {"message": "Prompt deleted successfully"}
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    except Exception as e:
-        logger.error(f"Error deleting prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error deleting prompt: {str(e)}")
 
 
 @router.put("/notebooks/{notebook_id}/active-prompt")
@@ -227,34 +213,19 @@ async def set_active_prompt(notebook_id: str, request: SetActivePromptRequest):
     - **prompt_id**: Prompt ID（null 表示取消設定）
     """
     try:
-        # Verify notebook exists
-        notebook = await Notebook.get(notebook_id)
-        if not notebook:
-            raise HTTPException(status_code=404, detail="Notebook not found")
-
-        # If setting a prompt, verify it exists
+        # If setting a prompt, verify it exists (a missing record raises
+        # NotFoundError); the notebook check happens in the UPDATE itself
+        full_prompt_id = None
         if request.prompt_id:
-            full_prompt_id = (
-                request.prompt_id
-                if request.prompt_id.startswith("system_prompt:")
-                else f"system_prompt:{request.prompt_id}"
-            )
-            prompt = await SystemPrompt.get(full_prompt_id)
-            if not prompt:
-                raise HTTPException(status_code=404, detail="Prompt not found")
-
-            await notebook.set_active_prompt(full_prompt_id)
-        else:
-            await notebook.set_active_prompt(None)
+            full_prompt_id = _full_prompt_id(request.prompt_id)
+            await SystemPrompt.get(full_prompt_id)
 
-        # Reload notebook to get updated active_prompt_id
-        notebook = await Notebook.get(notebook_id)
-        return {"message": "Active prompt updated successfully", "active_prompt_id": notebook.active_prompt_id}
+        active_prompt_id = await Notebook.set_active_prompt_by_id(
+            notebook_id, full_prompt_id
+        )
+        return {"message": "Active prompt updated successfully", "active_prompt_id": active_prompt_id}
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error setting active prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error setting active prompt: {str(e)}")
 
 
 @router.get("/notebooks/{notebook_id}/active-prompt", response_model=Optional[PromptResponse])
@@ -294,6 +265,3 @@ async def get_active_prompt(notebook_id: str):
         )
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Notebook not found")
-    except Exception as e:
-        logger.error(f"Error fetching active prompt: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching active prompt: {str(e)}")
@@ -1,11 +1,12 @@
-import asyncio
 import json
+import time
 from typing import AsyncGenerator, List, Optional
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
 from fastapi.responses import StreamingResponse
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import CompiledStateGraph
 from loguru import logger
 from pydantic import BaseModel, Field
 
@@ -14,10 +15,20 @@ from open_notebook.domain.notebook import ChatSession, Source
 from open_notebook.exceptions import (
     NotFoundError,
 )
-from open_notebook.graphs.source_chat import source_chat_graph as source_chat_graph
 
 router = APIRouter()
 
+# Shared by every session endpoint so the same SurrealQL text is sent each time;
+# only existence matters, so no edge fields are returned
+SESSION_SOURCE_RELATION_QUERY = (
+    "SELECT VALUE id FROM refers_to WHERE in = $session_id AND out = $source_id LIMIT 1"
+)
+
+
+def _get_source_chat_graph(request: Request) -> CompiledStateGraph:
+    """The source chat graph compiled in the app lifespan."""
+    return request.app.state.source_chat_graph
+
 
 # Request/Response models
 class CreateSourceChatSessionRequest(BaseModel):
@@ -108,7 +119,7 @@ async def create_source_chat_session(
 
         # Create new session with model_override support
         session = ChatSession(
-            title=request.title or f"Source Chat {asyncio.get_event_loop().time():.0f}",
+            title=request.title or f"Source Chat {int(time.time())}",
             model_override=request.model_override,
         )
         await session.save()
@@ -192,6 +203,7 @@ async def get_source_chat_sessions(source_id: str = Path(..., description="Sourc
 async def get_source_chat_session(
     source_id: str = Path(..., description="Source ID"),
     session_id: str = Path(..., description="Session ID"),
+    source_chat_graph: CompiledStateGraph = Depends(_get_source_chat_graph),
 ):
     """Get a specific source chat session with its messages."""
     try:
@@ -215,7 +227,7 @@ async def get_source_chat_session(
 
         # Verify session is related to this source
         relation_query = await repo_query(
-            "SELECT * FROM refers_to WHERE in = $session_id AND out = $source_id",
+            SESSION_SOURCE_RELATION_QUERY,
             {
                 "session_id": ensure_record_id(full_session_id),
                 "source_id": ensure_record_id(full_source_id),
@@ -228,7 +240,7 @@ async def get_source_chat_session(
             )
 
         # Get session state from LangGraph to retrieve messages
-        thread_state = source_chat_graph.get_state(
+        thread_state = await source_chat_graph.aget_state(
             config=RunnableConfig(configurable={"thread_id": session_id})
         )
 
@@ -238,18 +250,20 @@ async def get_source_chat_session(
 
         if thread_state and thread_state.values:
             # Extract messages
+            # Checkpointed messages are LangChain BaseMessages, so the fields
+            # are known to be present and valid; skip per-message validation
             if "messages" in thread_state.values:
-                for msg in thread_state.values["messages"]:
-                    messages.append(
-                        ChatMessage(
-                            id=getattr(msg, "id", f"msg_{len(messages)}"),
-                            type=msg.type if hasattr(msg, "type") else "unknown",
-                            content=msg.content
-                            if hasattr(msg, "content")
-                            else str(msg),
-                            timestamp=None,  # LangChain messages don't have timestamps by default
-                        )
+                messages = [
+                    ChatMessage.model_construct(
+                        id=msg.id or f"msg_{index}",
+                        type=msg.type,
+                        content=msg.content
+                        if isinstance(msg.content, str)
+                        else str(msg.content),
+                        timestamp=None,  # LangChain messages don't have timestamps by default
                     )
+                    for index, msg in enumerate(thread_state.values["messages"])
+                ]
 
             # Extract context indicators from the last state
             if "context_indicators" in thread_state.values:
@@ -311,7 +325,7 @@ async def update_source_chat_session(
 
         # Verify session is related to this source
         relation_query = await repo_query(
-            "SELECT * FROM refers_to WHERE in = $session_id AND out = $source_id",
+            SESSION_SOURCE_RELATION_QUERY,
             {
                 "session_id": ensure_record_id(full_session_id),
                 "source_id": ensure_record_id(full_source_id),
@@ -378,7 +392,7 @@ async def delete_source_chat_session(
 
         # Verify session is related to this source
         relation_query = await repo_query(
-            "SELECT * FROM refers_to WHERE in = $session_id AND out = $source_id",
+            SESSION_SOURCE_RELATION_QUERY,
             {
                 "session_id": ensure_record_id(full_session_id),
                 "source_id": ensure_record_id(full_source_id),
@@ -405,12 +419,16 @@ async def delete_source_chat_session(
 
 
 async def stream_source_chat_response(
-    session_id: str, source_id: str, message: str, model_override: Optional[str] = None
+    source_chat_graph: CompiledStateGraph,
+    session_id: str,
+    source_id: str,
+    message: str,
+    model_override: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
     """Stream the source chat response as Server-Sent Events."""
     try:
         # Get current state
-        current_state = source_chat_graph.get_state(
+        current_state = await source_chat_graph.aget_state(
             config=RunnableConfig(configurable={"thread_id": session_id})
         )
 
@@ -428,8 +446,8 @@ async def stream_source_chat_response(
         user_event = {"type": "user_message", "content": message, "timestamp": None}
         yield f"data: {json.dumps(user_event)}\n\n"
 
-        # Execute source chat graph synchronously (like notebook chat does)
-        result = source_chat_graph.invoke(
+        # Execute source chat graph (like notebook chat does)
+        result = await source_chat_graph.ainvoke(
             input=state_values,  # type: ignore[arg-type]
             config=RunnableConfig(
                 configurable={"thread_id": session_id, "model_id": model_override}
@@ -470,6 +488,7 @@ async def send_message_to_source_chat(
     request: SendMessageRequest,
     source_id: str = Path(..., description="Source ID"),
     session_id: str = Path(..., description="Session ID"),
+    source_chat_graph: CompiledStateGraph = Depends(_get_source_chat_graph),
 ):
     """Send a message to source chat session with SSE streaming response."""
     try:
@@ -493,7 +512,7 @@ async def send_message_to_source_chat(
 
         # Verify session is related to this source
         relation_query = await repo_query(
-            "SELECT * FROM refers_to WHERE in = $session_id AND out = $source_id",
+            SESSION_SOURCE_RELATION_QUERY,
             {
                 "session_id": ensure_record_id(full_session_id),
                 "source_id": ensure_record_id(full_source_id),
@@ -519,6 +538,7 @@ async def send_message_to_source_chat(
         # Return streaming response
         return StreamingResponse(
             stream_source_chat_response(
+                source_chat_graph=source_chat_graph,
                 session_id=session_id,
                 source_id=full_source_id,
                 message=request.message,
@@ -27,6 +27,7 @@ from api.models import (
     SourceStatusResponse,
     SourceUpdate,
 )
+from api.responses import OrjsonResponse
 from commands.source_commands import SourceProcessingInput
 from open_notebook.config import UPLOADS_FOLDER
 from open_notebook.database.repository import ensure_record_id, repo_query
@@ -148,7 +149,8 @@ def parse_source_form_data(
     return source_data, file
 
 
-@router.get("/sources", response_model=List[SourceListResponse])
+# Returns prebuilt dicts, so the model is declared for the docs only
+@router.get("/sources", responses={200: {"model": List[SourceListResponse]}})
 async def get_sources(
     notebook_id: Optional[str] = Query(None, description="Filter by notebook ID"),
     limit: int = Query(
@@ -243,32 +245,34 @@ async def get_sources(
                 command_id = str(command)
                 status = "unknown"
 
+            asset = row.get("asset")
+            # Plain dicts keyed like SourceListResponse, returned as OrjsonResponse
+            # serializes them directly instead of validating a model per row
             response_list.append(
-                SourceListResponse(
-                    id=row["id"],
-                    title=row.get("title"),
-                    topics=row.get("topics") or [],
-                    asset=AssetModel(
-                        file_path=row["asset"].get("file_path")
-                        if row.get("asset")
-                        else None,
-                        url=row["asset"].get("url") if row.get("asset") else None,
-                    )
-                    if row.get("asset")
+                {
+                    "id": row["id"],
+                    "title": row.get("title"),
+                    "topics": row.get("topics") or [],
+                    "asset": {
+                        "file_path": asset.get("file_path"),
+                        "url": asset.get("url"),
+                    }
+                    if asset
                     else None,
-                    embedded=row.get("embedded", False),
-                    embedded_chunks=0,  # Not needed in list view
-                    insights_count=row.get("insights_count", 0),
-                    created=str(row["created"]),
-                    updated=str(row["updated"]),
+                    "embedded": row.get("embedded", False),
+                    "embedded_chunks": 0,  # Not needed in list view
+                    "insights_count": row.get("insights_count", 0),
+                    "created": str(row["created"]),
+                    "updated": str(row["updated"]),
+                    "file_available": None,
                     # Status fields from fetched command
-                    command_id=command_id,
-                    status=status,
-                    processing_info=processing_info,
-                )
+                    "command_id": command_id,
+                    "status": status,
+                    "processing_info": processing_info,
+                }
             )
 
-        return response_list
+        return OrjsonResponse(response_list)
     except HTTPException:
         raise
     except Exception as e:
@@ -1,7 +1,11 @@
-from typing import List
+import asyncio
+import base64
+from typing import Any, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query
 from loguru import logger
+from surrealdb import InvalidRecordIdError  # type: ignore
 
 from api.models import (
     DefaultPromptResponse,
@@ -12,33 +16,154 @@ from api.models import (
     TransformationResponse,
     TransformationUpdate,
 )
+from api.responses import OrjsonResponse
 from open_notebook.ai.models import Model
+from open_notebook.database.repository import ensure_record_id, repo_query
 from open_notebook.domain.transformation import DefaultPrompts, Transformation
 from open_notebook.exceptions import InvalidInputError
 from open_notebook.graphs.transformation import graph as transformation_graph
 
 router = APIRouter()
 
+TRANSFORMATION_FIELDS = (
+    "id, name, title, description, prompt, apply_default, created, updated"
+)
+TRANSFORMATIONS_QUERY = (
+    f"SELECT {TRANSFORMATION_FIELDS} FROM transformation ORDER BY name ASC, id ASC"
+)
+# Keyset pagination on (name, id), so each page seeks past the previous one
+# instead of offsetting
+TRANSFORMATIONS_PAGE_QUERY = f"""
+    SELECT {TRANSFORMATION_FIELDS}
+    FROM transformation
+    WHERE (
+        $cursor_name = NONE
+        OR name > $cursor_name
+        OR (name = $cursor_name AND id > $cursor_id)
+    )
+    ORDER BY name ASC, id ASC
+    LIMIT $limit
+"""
+DEFAULT_PAGE_SIZE = 100
+
+# Execute looks up the transformation and the model on every call, and both
+# change rarely. Transformation writes below evict their entry; models can't
+# be edited, so a deleted one at worst lingers until its entry expires.
+_xform_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+_model_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+
+
+def _xform_cache_key(transformation_id: str) -> str:
+    """Canonical form of an ID, so every spelling of it shares one entry."""
+    try:
+        return str(ensure_record_id(transformation_id))
+    except InvalidRecordIdError:
+        # Unparseable IDs are never found, so they are never cached either
+        return transformation_id
+
+
+async def _get_transformation_cached(
+    transformation_id: str,
+) -> Optional[Transformation]:
+    key = _xform_cache_key(transformation_id)
+    transformation = _xform_cache.get(key)
+    if transformation is None:
+        transformation = await Transformation.get(transformation_id)
+        if transformation:
+            _xform_cache[key] = transformation
+    return transformation
+
+
+async def _get_model_cached(model_id: str) -> Optional[Model]:
+    model = _model_cache.get(model_id)
+    if model is None:
+        model = await Model.get(model_id)
+        if model:
+            _model_cache[model_id] = model
+    return model
+
+
+def encode_transformation_cursor(name: str, transformation_id: Any) -> str:
+    """Encode the last row of a page as an opaque cursor."""
+    raw = f"{name}|{transformation_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
 
-@router.get("/transformations", response_model=List[TransformationResponse])
-async def get_transformations():
-    """Get all transformations."""
+
+def decode_transformation_cursor(cursor: str) -> Tuple[str, Any]:
+    """Decode a page cursor; raises InvalidInputError if malformed."""
     try:
-        transformations = await Transformation.get_all(order_by="name asc")
-
-        return [
-            TransformationResponse(
-                id=transformation.id or "",
-                name=transformation.name,
-                title=transformation.title,
-                description=transformation.description,
-                prompt=transformation.prompt,
-                apply_default=transformation.apply_default,
-                created=str(transformation.created),
-                updated=str(transformation.updated),
+        # Names may contain the separator, IDs don't
+        name, transformation_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        )
+        return name, ensure_record_id(transformation_id)
+    except Exception as e:
+        raise InvalidInputError(f"Invalid cursor: {cursor}") from e
+
+
+def _to_response(transformation: Transformation) -> TransformationResponse:
+    """Build the response from a transformation the domain model already validated."""
+    return TransformationResponse.model_construct(
+        id=transformation.id or "",
+        name=transformation.name,
+        title=transformation.title,
+        description=transformation.description,
+        prompt=transformation.prompt,
+        apply_default=transformation.apply_default,
+        created=transformation.created_iso,
+        updated=transformation.updated_iso,
+    )
+
+
+# Returns the rows as read, so the model is declared for the docs only
+@router.get(
+    "/transformations", responses={200: {"model": List[TransformationResponse]}}
+)
+async def get_transformations(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=500,
+        description="Transformations per page (default: all, or "
+        f"{DEFAULT_PAGE_SIZE} when a cursor is given)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor header from the previous page"
+    ),
+):
+    """Get transformations ordered by name, optionally one page at a time.
+
+    A paged response carries an X-Next-Cursor header while further pages
+    remain; the body is the same list either way.
+    """
+    # A malformed cursor raises InvalidInputError, which the app maps to 400
+    cursor_name, cursor_id = (
+        decode_transformation_cursor(cursor) if cursor else (None, None)
+    )
+    try:
+        # The table is SCHEMAFULL, so rows already have the response's fields
+        # and skip the domain model and response model round trip
+        if limit is None and cursor is None:
+            return OrjsonResponse(await repo_query(TRANSFORMATIONS_QUERY))
+
+        page_size = limit or DEFAULT_PAGE_SIZE
+        rows = await repo_query(
+            TRANSFORMATIONS_PAGE_QUERY,
+            {
+                "cursor_name": cursor_name,
+                "cursor_id": cursor_id,
+                # One extra row tells us whether another page exists
+                "limit": page_size + 1,
+            },
+        )
+        headers = {}
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            headers["X-Next-Cursor"] = encode_transformation_cursor(
+                rows[-1]["name"], rows[-1]["id"]
             )
-            for transformation in transformations
-        ]
+
+        return OrjsonResponse(rows, headers=headers)
     except Exception as e:
         logger.error(f"Error fetching transformations: {str(e)}")
         raise HTTPException(
@@ -59,16 +184,7 @@ async def create_transformation(transformation_data: TransformationCreate):
         )
         await new_transformation.save()
 
-        return TransformationResponse(
-            id=new_transformation.id or "",
-            name=new_transformation.name,
-            title=new_transformation.title,
-            description=new_transformation.description,
-            prompt=new_transformation.prompt,
-            apply_default=new_transformation.apply_default,
-            created=str(new_transformation.created),
-            updated=str(new_transformation.updated),
-        )
+        return _to_response(new_transformation)
     except InvalidInputError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -82,13 +198,13 @@ async def create_transformation(transformation_data: TransformationCreate):
 async def execute_transformation(execute_request: TransformationExecuteRequest):
     """Execute a transformation on input text."""
     try:
-        # Validate transformation exists
-        transformation = await Transformation.get(execute_request.transformation_id)
+        # Validate transformation and model exist; the lookups are independent
+        transformation, model = await asyncio.gather(
+            _get_transformation_cached(execute_request.transformation_id),
+            _get_model_cached(execute_request.model_id),
+        )
         if not transformation:
             raise HTTPException(status_code=404, detail="Transformation not found")
-
-        # Validate model exists
-        model = await Model.get(execute_request.model_id)
         if not model:
             raise HTTPException(status_code=404, detail="Model not found")
 
@@ -164,16 +280,7 @@ async def get_transformation(transformation_id: str):
         if not transformation:
             raise HTTPException(status_code=404, detail="Transformation not found")
 
-        return TransformationResponse(
-            id=transformation.id or "",
-            name=transformation.name,
-            title=transformation.title,
-            description=transformation.description,
-            prompt=transformation.prompt,
-            apply_default=transformation.apply_default,
-            created=str(transformation.created),
-            updated=str(transformation.updated),
-        )
+        return _to_response(transformation)
     except HTTPException:
         raise
     except Exception as e:
@@ -191,34 +298,17 @@ async def update_transformation(
 ):
     """Update a transformation."""
     try:
-        transformation = await Transformation.get(transformation_id)
+        # Update only provided fields; none of them are nullable, so an
+        # explicit null leaves the field unchanged
+        transformation = await Transformation.update_by_id(
+            transformation_id,
+            transformation_update.model_dump(exclude_unset=True, exclude_none=True),
+        )
         if not transformation:
             raise HTTPException(status_code=404, detail="Transformation not found")
+        _xform_cache.pop(_xform_cache_key(transformation_id), None)
 
-        # Update only provided fields
-        if transformation_update.name is not None:
-            transformation.name = transformation_update.name
-        if transformation_update.title is not None:
-            transformation.title = transformation_update.title
-        if transformation_update.description is not None:
-            transformation.description = transformation_update.description
-        if transformation_update.prompt is not None:
-            transformation.prompt = transformation_update.prompt
-        if transformation_update.apply_default is not None:
-            transformation.apply_default = transformation_update.apply_default
-
-        await transformation.save()
-
-        return TransformationResponse(
-            id=transformation.id or "",
-            name=transformation.name,
-            title=transformation.title,
-            description=transformation.description,
-            prompt=transformation.prompt,
-            apply_default=transformation.apply_default,
-            created=str(transformation.created),
-            updated=str(transformation.updated),
-        )
+        return _to_response(transformation)
     except HTTPException:
         raise
     except InvalidInputError as e:
@@ -234,11 +324,9 @@ async def update_transformation(
 async def delete_transformation(transformation_id: str):
     """Delete a transformation."""
     try:
-        transformation = await Transformation.get(transformation_id)
-        if not transformation:
+        if not await Transformation.delete_by_id(transformation_id):
             raise HTTPException(status_code=404, detail="Transformation not found")
-
-        await transformation.delete()
+        _xform_cache.pop(_xform_cache_key(transformation_id), None)
 
         return {"message": "Transformation deleted successfully"}
     except HTTPException:
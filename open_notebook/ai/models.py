@@ -1,5 +1,6 @@
 from typing import ClassVar, Dict, Optional, Union
 
+from cachetools import TTLCache
 from esperanto import (
     AIFactory,
     EmbeddingModel,
@@ -14,6 +15,17 @@ from open_notebook.domain.base import ObjectModel, RecordModel
 
 ModelType = Union[LanguageModel, EmbeddingModel, SpeechToTextModel, TextToSpeechModel]
 
+# LangChain clients built by ai.provision, keyed on the selection outcome.
+# Model and DefaultModels writes clear it in the process that makes them;
+# other processes (the worker, other API workers) pick up a change once the
+# entry expires, so they may use the previous model for up to the TTL.
+provisioned_clients: TTLCache = TTLCache(maxsize=32, ttl=300)
+
+
+def clear_provision_cache() -> None:
+    """Drop cached clients after model or default-model changes."""
+    provisioned_clients.clear()
+
 
 class Model(ObjectModel):
     table_name: ClassVar[str] = "model"
@@ -21,6 +33,16 @@ class Model(ObjectModel):
     provider: str
     type: str
 
+    async def save(self) -> None:
+        await super().save()
+        clear_provision_cache()
+
+    async def delete(self) -> bool:
+        try:
+            return await super().delete()
+        finally:
+            clear_provision_cache()
+
     @classmethod
     async def get_models_by_type(cls, model_type):
         models = await repo_query(
@@ -64,6 +86,11 @@ class DefaultModels(RecordModel):
         super(RecordModel, instance).__init__(**data)
         return instance
 
+    async def update(self):
+        result = await super().update()
+        clear_provision_cache()
+        return result
+
 
 class ModelManager:
     def __init__(self):
@@ -2,7 +2,7 @@ from esperanto import LanguageModel
 from langchain_core.language_models.chat_models import BaseChatModel
 from loguru import logger
 
-from open_notebook.ai.models import model_manager
+from open_notebook.ai.models import model_manager, provisioned_clients
 from open_notebook.utils import token_count
 
 
@@ -16,6 +16,17 @@ async def provision_langchain_model(
     Otherwise, returns the default model for the given type
     """
     tokens = token_count(content)
+    if tokens > 105_000:
+        selection = ("large_context", None)
+    elif model_id:
+        selection = ("model_id", model_id)
+    else:
+        selection = ("default", default_type)
+    cache_key = (selection, repr(sorted(kwargs.items())))
+    cached = provisioned_clients.get(cache_key)
+    if cached is not None:
+        return cached
+
     model = None
     selection_reason = ""
 
@@ -57,4 +68,6 @@ async def provision_langchain_model(
             f"Please check that the model configured for '{default_type}' is a language model, not an embedding or speech model."
         )
 
-    return model.to_langchain()
+    langchain_model = model.to_langchain()
+    provisioned_clients[cache_key] = langchain_model
+    return langchain_model
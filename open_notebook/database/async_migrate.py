@@ -106,6 +106,7 @@ class AsyncMigrationManager:
             AsyncMigration.from_file("open_notebook/database/migrations/8.surrealql"),
             AsyncMigration.from_file("open_notebook/database/migrations/8_1.surrealql"),
             AsyncMigration.from_file("open_notebook/database/migrations/10.surrealql"),
+            AsyncMigration.from_file("open_notebook/database/migrations/11.surrealql"),
         ]
         self.down_migrations = [
             AsyncMigration.from_file(
@@ -138,12 +139,20 @@ class AsyncMigrationManager:
             AsyncMigration.from_file(
                 "open_notebook/database/migrations/10_down.surrealql"
             ),
+            AsyncMigration.from_file(
+                "open_notebook/database/migrations/11_down.surrealql"
+            ),
         ]
         self.runner = AsyncMigrationRunner(
             up_migrations=self.up_migrations,
             down_migrations=self.down_migrations,
         )
 
+    @property
+    def expected_version(self) -> int:
+        """Schema version this code expects (number of up migrations)."""
+        return len(self.up_migrations)
+
     async def get_current_version(self) -> int:
         """Get current database version."""
         return await get_latest_version()
@@ -174,10 +183,13 @@ class AsyncMigrationManager:
 async def get_latest_version() -> int:
     """Get the latest version from the migrations table."""
     try:
-        versions = await get_all_versions()
+        # Only the highest version is needed, so don't fetch every row
+        versions = await repo_query(
+            "SELECT VALUE version FROM _sbl_migrations ORDER BY version DESC LIMIT 1;"
+        )
         if not versions:
             return 0
-        return max(version["version"] for version in versions)
+        return versions[0]
     except Exception:
         # If migrations table doesn't exist, we're at version 0
         return 0
@@ -1,7 +1,9 @@
+import asyncio
 import os
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, TypeVar, Union
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
 
 from loguru import logger
 from surrealdb import AsyncSurreal, RecordID  # type: ignore
@@ -44,8 +46,7 @@ def ensure_record_id(value: Union[str, RecordID]) -> RecordID:
     return RecordID.parse(value)
 
 
-@asynccontextmanager
-async def db_connection():
+async def _open_connection() -> AsyncSurreal:
     db = AsyncSurreal(get_database_url())
     await db.signin(
         {
@@ -56,10 +57,137 @@ async def db_connection():
     await db.use(
         os.environ.get("SURREAL_NAMESPACE"), os.environ.get("SURREAL_DATABASE")
     )
+    return db
+
+
+class ConnectionPool:
+    """Reuses signed-in connections instead of opening one per query.
+
+    ``warm_up`` opens ``min_size`` connections ahead of time; beyond that,
+    connections are created lazily up to ``max_size`` and callers past the
+    limit wait for one to be released. A connection that was in use when an error
+    was raised is closed rather than returned, so a broken socket never goes
+    back into the pool. One that sat idle for longer than ``ping_after``
+    seconds is pinged before reuse and replaced if the server dropped it.
+    """
+
+    def __init__(self, max_size: int, min_size: int = 0, ping_after: float = 30.0):
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.ping_after = ping_after
+        # (connection, monotonic time it went idle)
+        self._idle: List[Tuple[AsyncSurreal, float]] = []
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def acquire(self) -> AsyncSurreal:
+        await self._slots.acquire()
+        try:
+            if not self._idle:
+                return await _open_connection()
+            db, idle_since = self._idle.pop()
+            if time.monotonic() - idle_since > self.ping_after:
+                try:
+                    await db.version()
+                except Exception as e:
+                    logger.debug(f"Replacing stale pooled connection: {e}")
+                    with suppress(Exception):
+                        await db.close()
+                    return await _open_connection()
+            return db
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def warm_up(self) -> int:
+        """Open idle connections up to ``min_size``; returns how many were opened."""
+        missing = self.min_size - len(self._idle)
+        if missing <= 0:
+            return 0
+        results = await asyncio.gather(
+            *(_open_connection() for _ in range(missing)), return_exceptions=True
+        )
+        opened = [db for db in results if not isinstance(db, BaseException)]
+        now = time.monotonic()
+        self._idle.extend((db, now) for db in opened)
+        if len(opened) < missing:
+            error = next(r for r in results if isinstance(r, BaseException))
+            logger.warning(
+                f"Opened {len(opened)}/{missing} pooled connections at startup: {error}"
+            )
+        return len(opened)
+
+    async def release(self, db: AsyncSurreal, discard: bool = False) -> None:
+        try:
+            if discard:
+                with suppress(Exception):
+                    await db.close()
+            else:
+                self._idle.append((db, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for db, _ in idle:
+            with suppress(Exception):
+                await db.close()
+
+
+_pool: Optional[ConnectionPool] = None
+# Pooled websockets are bound to the loop that opened them (the client keeps
+# its receive task and futures there), so only that loop may use the pool
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def init_db_pool(
+    max_size: Optional[int] = None, min_size: Optional[int] = None
+) -> ConnectionPool:
+    """Enable connection pooling for this process (call once the event loop is running).
+
+    Only the calling event loop uses the pool; code running on any other loop
+    (``asyncio.run`` in a worker thread, for example) gets one-off connections.
+    """
+    global _pool, _pool_loop
+    if _pool is None:
+        _pool_loop = asyncio.get_running_loop()
+        _pool = ConnectionPool(
+            max_size or int(os.environ.get("SURREAL_POOL_SIZE", "10")),
+            min_size
+            if min_size is not None
+            else int(os.environ.get("SURREAL_POOL_MIN_SIZE", "4")),
+            float(os.environ.get("SURREAL_POOL_PING_AFTER", "30")),
+        )
+        await _pool.warm_up()
+    return _pool
+
+
+async def close_db_pool() -> None:
+    """Close pooled connections; later queries fall back to one-off connections."""
+    global _pool, _pool_loop
+    pool, _pool = _pool, None
+    _pool_loop = None
+    if pool is not None:
+        await pool.close()
+
+
+@asynccontextmanager
+async def db_connection():
+    pool = _pool
+    if pool is None or asyncio.get_running_loop() is not _pool_loop:
+        db = await _open_connection()
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+
+    db = await pool.acquire()
     try:
         yield db
-    finally:
-        await db.close()
+    except BaseException:
+        await pool.release(db, discard=True)
+        raise
+    await pool.release(db)
 
 
 async def repo_query(
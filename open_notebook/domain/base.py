@@ -94,6 +94,28 @@ class ObjectModel(BaseModel):
             logger.exception(e)
             raise NotFoundError(f"Object with id {id} not found - {str(e)}")
 
+    @classmethod
+    async def get_many(cls: Type[T], ids: List[str]) -> List[T]:
+        """Fetch several records of this model in one query, in the given order.
+
+        IDs that don't exist are skipped rather than raising NotFoundError.
+        """
+        if not ids:
+            return []
+        try:
+            record_ids = [ensure_record_id(id) for id in ids]
+            result = await repo_query("SELECT * FROM $ids", {"ids": record_ids})
+            by_id = {row["id"]: row for row in result}
+            return [
+                cls(**by_id[str(record_id)])
+                for record_id in record_ids
+                if str(record_id) in by_id
+            ]
+        except Exception as e:
+            logger.error(f"Error fetching {cls.table_name} records: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError(e)
+
     @classmethod
     def _get_class_by_table_name(cls, table_name: str) -> Optional[Type["ObjectModel"]]:
         """Find the appropriate subclass based on table_name."""
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Union
 
+from cachetools import TTLCache
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from surreal_commands import submit_command
@@ -10,7 +11,29 @@ from surrealdb import RecordID
 
 from open_notebook.database.repository import ensure_record_id, repo_query, repo_relate
 from open_notebook.domain.base import ObjectModel
-from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
+from open_notebook.exceptions import (
+    DatabaseOperationError,
+    InvalidInputError,
+    NotFoundError,
+)
+
+# Existence check and prompt traversal in one statement; yields nothing (rather
+# than an empty list) when the notebook is missing
+NOTEBOOK_PROMPTS_QUERY = """
+IF array::len((SELECT VALUE id FROM $id)) > 0 {
+    RETURN (
+        SELECT * FROM (
+            SELECT out AS prompt FROM prompts_for WHERE in = $id FETCH prompt
+        ) ORDER BY prompt.updated DESC
+    );
+};
+"""
+
+# UPDATE on a missing record returns no rows
+SET_ACTIVE_PROMPT_QUERY = """
+UPDATE $id SET active_prompt_id = $prompt_id, updated = time::now()
+RETURN VALUE active_prompt_id
+"""
 
 
 class Notebook(ObjectModel):
@@ -106,6 +129,38 @@ class Notebook(ObjectModel):
             logger.exception(e)
             raise DatabaseOperationError(e)
 
+    @classmethod
+    async def exists(cls, notebook_id: str) -> bool:
+        """Check a notebook exists without loading it; IDs from other tables don't."""
+        record_id = ensure_record_id(notebook_id)
+        if record_id.table_name != cls.table_name:
+            return False
+        result = await repo_query("SELECT VALUE id FROM $id", {"id": record_id})
+        return bool(result)
+
+    @classmethod
+    async def get_prompts_by_id(cls, notebook_id: str) -> List["SystemPrompt"]:
+        """Fetch a notebook's prompts without loading the notebook first."""
+        result = await repo_query(
+            NOTEBOOK_PROMPTS_QUERY, {"id": ensure_record_id(notebook_id)}
+        )
+        if result is None:
+            raise NotFoundError(f"notebook with id {notebook_id} not found")
+        return [SystemPrompt(**row["prompt"]) for row in result]
+
+    @classmethod
+    async def set_active_prompt_by_id(
+        cls, notebook_id: str, prompt_id: Optional[str]
+    ) -> Optional[str]:
+        """Set a notebook's active prompt in a single UPDATE; returns the stored ID."""
+        result = await repo_query(
+            SET_ACTIVE_PROMPT_QUERY,
+            {"id": ensure_record_id(notebook_id), "prompt_id": prompt_id},
+        )
+        if not result:
+            raise NotFoundError(f"notebook with id {notebook_id} not found")
+        return result[0]
+
     async def get_active_prompt(self) -> Optional["SystemPrompt"]:
         """Get the active system prompt for this notebook."""
         if not self.active_prompt_id:
@@ -398,7 +453,14 @@ class Source(ObjectModel):
     async def get_context(
         self, context_size: Literal["short", "long"] = "short"
     ) -> Dict[str, Any]:
-        insights_list = await self.get_insights()
+        return self.build_context(await self.get_insights(), context_size)
+
+    def build_context(
+        self,
+        insights_list: List[SourceInsight],
+        context_size: Literal["short", "long"] = "short",
+    ) -> Dict[str, Any]:
+        """Context dict for this source from already-fetched insights."""
         insights = [insight.model_dump() for insight in insights_list]
         if context_size == "long":
             return dict(
@@ -440,6 +502,32 @@ class Source(ObjectModel):
             logger.exception(e)
             raise DatabaseOperationError("Failed to fetch insights for source")
 
+    @classmethod
+    async def get_insights_for(
+        cls, source_ids: List[str]
+    ) -> Dict[str, List[SourceInsight]]:
+        """Fetch the insights of several sources in one query, keyed by source ID."""
+        record_ids = [ensure_record_id(id) for id in source_ids]
+        insights: Dict[str, List[SourceInsight]] = {str(id): [] for id in record_ids}
+        if not record_ids:
+            return insights
+        try:
+            result = await repo_query(
+                """
+                SELECT * FROM source_insight WHERE source IN $ids
+                """,
+                {"ids": record_ids},
+            )
+            for row in result:
+                insights.setdefault(str(row["source"]), []).append(
+                    SourceInsight(**row)
+                )
+            return insights
+        except Exception as e:
+            logger.error(f"Error fetching insights for sources: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError("Failed to fetch insights for sources")
+
     async def add_to_notebook(self, notebook_id: str) -> Any:
         if not notebook_id:
             raise InvalidInputError("Notebook ID must be provided")
@@ -590,12 +678,35 @@ class Source(ObjectModel):
         return await super().delete()
 
 
+# Existence check and edge traversal in one statement; yields nothing (rather
+# than an empty list) when the notebook is missing
+NOTEBOOK_NOTES_QUERY = """
+IF array::len((SELECT VALUE id FROM $id)) > 0 {
+    RETURN (
+        SELECT * OMIT note.content, note.embedding FROM (
+            SELECT in AS note FROM artifact WHERE out = $id FETCH note
+        ) ORDER BY note.updated DESC
+    );
+};
+"""
+
+
 class Note(ObjectModel):
     table_name: ClassVar[str] = "note"
     title: Optional[str] = None
     note_type: Optional[Literal["human", "ai"]] = None
     content: Optional[str] = None
 
+    @classmethod
+    async def get_for_notebook(cls, notebook_id: str) -> List["Note"]:
+        """Fetch a notebook's notes (without content) in a single query."""
+        result = await repo_query(
+            NOTEBOOK_NOTES_QUERY, {"id": ensure_record_id(notebook_id)}
+        )
+        if result is None:
+            raise NotFoundError(f"notebook with id {notebook_id} not found")
+        return [cls(**row["note"]) for row in result]
+
     @field_validator("content")
     @classmethod
     def content_must_not_be_empty(cls, v):
@@ -646,11 +757,33 @@ class Note(ObjectModel):
             )
 
 
+# Prompt content by ID. Read on every chat turn but rarely edited; entries
+# are dropped on save/delete in this process and expire after a minute.
+_prompt_content_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
 class SystemPrompt(ObjectModel):
     table_name: ClassVar[str] = "system_prompt"
     name: str
     content: str
 
+    @classmethod
+    async def get_content(cls, id: str) -> str:
+        """Get a prompt's content by ID, cached briefly in-process."""
+        content = _prompt_content_cache.get(id)
+        if content is None:
+            content = (await cls.get(id)).content
+            _prompt_content_cache[id] = content
+        return content
+
+    async def save(self) -> None:
+        await super().save()
+        _prompt_content_cache.pop(self.id, None)
+
+    async def delete(self) -> bool:
+        _prompt_content_cache.pop(self.id, None)
+        return await super().delete()
+
     async def relate_to_notebook(self, notebook_id: str) -> Any:
         if not notebook_id or not self.id:
             raise InvalidInputError("Notebook ID and prompt ID must be provided")
@@ -661,12 +794,48 @@ class SystemPrompt(ObjectModel):
         )
 
 
+# Hot path for every chat turn; kept as one constant so the query text is
+# identical on each call
+SESSION_WITH_NOTEBOOK_QUERY = """
+SELECT *,
+(SELECT VALUE out FROM refers_to WHERE in = $parent.id)[0] AS notebook
+FROM $id
+FETCH notebook
+"""
+
+
 class ChatSession(ObjectModel):
     table_name: ClassVar[str] = "chat_session"
     nullable_fields: ClassVar[set[str]] = {"model_override"}
     title: Optional[str] = None
     model_override: Optional[str] = None
 
+    @classmethod
+    async def get_with_notebook(
+        cls, id: str
+    ) -> Tuple["ChatSession", Optional[Notebook]]:
+        """Fetch a session and the notebook it refers to in a single query."""
+        result = await repo_query(
+            SESSION_WITH_NOTEBOOK_QUERY, {"id": ensure_record_id(id)}
+        )
+        if not result:
+            raise NotFoundError(f"chat_session with id {id} not found")
+        row = dict(result[0])
+        notebook_row = row.pop("notebook", None)
+        notebook = (
+            Notebook(**notebook_row)
+            if isinstance(notebook_row, dict)
+            and str(notebook_row.get("id", "")).startswith("notebook:")
+            else None
+        )
+        return cls(**row), notebook
+
+    async def touch(self) -> None:
+        """Bump ``updated`` without rewriting the rest of the record."""
+        await repo_query(
+            "UPDATE $id SET updated = time::now()", {"id": ensure_record_id(self.id)}
+        )
+
     async def relate_to_notebook(self, notebook_id: str) -> Any:
         if not notebook_id:
             raise InvalidInputError("Notebook ID must be provided")
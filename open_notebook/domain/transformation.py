@@ -1,7 +1,9 @@
-from typing import ClassVar, Optional
+from functools import cached_property
+from typing import Any, ClassVar, Dict, Optional
 
 from pydantic import Field
 
+from open_notebook.database.repository import ensure_record_id, repo_query
 from open_notebook.domain.base import ObjectModel, RecordModel
 
 
@@ -13,6 +15,44 @@ class Transformation(ObjectModel):
     prompt: str
     apply_default: bool
 
+    @cached_property
+    def created_iso(self) -> str:
+        return self.created.isoformat() if self.created else ""
+
+    @cached_property
+    def updated_iso(self) -> str:
+        return self.updated.isoformat() if self.updated else ""
+
+    async def save(self) -> None:
+        await super().save()
+        # Saving refreshes created/updated from the database
+        self.__dict__.pop("created_iso", None)
+        self.__dict__.pop("updated_iso", None)
+
+    @classmethod
+    async def update_by_id(
+        cls, transformation_id: str, fields: Dict[str, Any]
+    ) -> Optional["Transformation"]:
+        """Merge fields into a transformation in one UPDATE; None if it doesn't exist."""
+        record_id = ensure_record_id(transformation_id)
+        if record_id.table_name != cls.table_name:
+            return None
+        # UPDATE on a missing record returns no rows rather than creating it
+        result = await repo_query(
+            "UPDATE $id MERGE $data RETURN AFTER", {"id": record_id, "data": fields}
+        )
+        return cls(**result[0]) if result else None
+
+    @classmethod
+    async def delete_by_id(cls, transformation_id: str) -> bool:
+        """Delete a transformation in one statement; False if it didn't exist."""
+        record_id = ensure_record_id(transformation_id)
+        if record_id.table_name != cls.table_name:
+            return False
+        # RETURN BEFORE is empty when nothing was deleted
+        result = await repo_query("DELETE $id RETURN BEFORE", {"id": record_id})
+        return bool(result)
+
 
 class DefaultPrompts(RecordModel):
     record_id: ClassVar[str] = "open_notebook:default_prompts"
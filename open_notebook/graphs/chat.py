@@ -1,13 +1,13 @@
-import asyncio
-import sqlite3
 from typing import Annotated, Optional
 
+import aiosqlite
 from ai_prompter import Prompter
 from langchain_core.messages import AIMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
 from typing_extensions import TypedDict
 
 from open_notebook.ai.provision import provision_langchain_model
@@ -26,68 +26,14 @@ class ThreadState(TypedDict):
     include_citations: Optional[bool]
 
 
-def call_model_with_messages(state: ThreadState, config: RunnableConfig) -> dict:
-    # Use custom system prompt if provided, otherwise use default template
-    custom_prompt = state.get("custom_system_prompt")
-    include_citations = state.get("include_citations", True)
+# Built once at import; Prompter compiles the Jinja template on construction
+_CHAT_SYSTEM_PROMPTER = Prompter(prompt_template="chat/system")
 
-    if custom_prompt:
-        # Build context string from state
-        context_str = ""
-        context_data = state.get("context", {})
-
-        # Add sources to context
-        if context_data and "sources" in context_data:
-            for source in context_data["sources"]:
-                source_id = source.get("id", "unknown")
-                # Only show ID in context if citations are enabled
-                if include_citations:
-                    context_str += (
-                        f"\n\n## Source: {source.get('title', 'Unknown')} [ID: {source_id}]\n"
-                    )
-                else:
-                    context_str += (
-                        f"\n\n## Source: {source.get('title', 'Unknown')}\n"
-                    )
-
-                # Add full text content if available (for "full content" mode)
-                if "full_text" in source:
-                    context_str += f"\n### Full Content\n{source.get('full_text', '')}\n"
-
-                # Add insights if available (for "insights" mode or as additional context)
-                if "insights" in source:
-                    for insight in source["insights"]:
-                        insight_id = insight.get("id", "unknown")
-                        insight_type = insight.get("insight_type", "Insight")
-                        # Only show ID in context if citations are enabled
-                        if include_citations:
-                            context_str += (
-                                f"\n### {insight_type} [ID: {insight_id}]\n{insight.get('content', '')}\n"
-                            )
-                        else:
-                            context_str += (
-                                f"\n### {insight_type}\n{insight.get('content', '')}\n"
-                            )
-
-        # Add notes to context
-        if context_data and "notes" in context_data:
-            for note in context_data["notes"]:
-                note_id = note.get("id", "unknown")
-                # Only show ID in context if citations are enabled
-                if include_citations:
-                    context_str += (
-                        f"\n\n## Note: {note.get('title', 'Unknown')} [ID: {note_id}]\n{note.get('content', '')}\n"
-                    )
-                else:
-                    context_str += (
-                        f"\n\n## Note: {note.get('title', 'Unknown')}\n{note.get('content', '')}\n"
-                    )
+_ROLE_REMINDER = "IMPORTANT: You must follow the role and behavior described above in your current response, regardless of what role you may have taken in previous messages."
 
-        # Combine custom prompt with context
-        if context_str:
-            # Only add citing instructions if citations are enabled
-            if include_citations:
-                citing_instructions = """
+_NO_CITATIONS_DEFAULT_PROMPT = "You are a helpful AI assistant."
+
+_CITING_INSTRUCTIONS = """
 # CITING INSTRUCTIONS
 If your answer is based on any item in the context above, add references to the documents by including the document ID in brackets like this: [document_id].
 
@@ -98,53 +44,81 @@ IMPORTANT:
 - IDs have prefixes like "source:", "source_insight:", "note:"
 - Do not make up or modify document IDs
 """
-            else:
-                citing_instructions = ""
+
+
+def _render_insight(insight: dict, include_citations: bool) -> str:
+    """Render one source insight as a markdown subsection."""
+    insight_type = insight.get("insight_type", "Insight")
+    id_suffix = f" [ID: {insight.get('id', 'unknown')}]" if include_citations else ""
+    return f"\n### {insight_type}{id_suffix}\n{insight.get('content', '')}\n"
+
+
+def _render_context(context_data: Optional[dict], include_citations: bool) -> str:
+    """Render selected sources, insights and notes as markdown sections.
+
+    IDs are only shown when citations are enabled. Fragments are collected
+    in a list and joined once, so large contexts stay linear.
+    """
+    if not context_data:
+        return ""
+    parts: list[str] = []
+
+    for source in context_data.get("sources", []):
+        title = source.get("title", "Unknown")
+        id_suffix = (
+            f" [ID: {source.get('id', 'unknown')}]" if include_citations else ""
+        )
+        parts.append(f"\n\n## Source: {title}{id_suffix}\n")
+
+        # Add full text content if available (for "full content" mode)
+        if "full_text" in source:
+            parts.append(f"\n### Full Content\n{source['full_text']}\n")
+
+        # Add insights if available (for "insights" mode or as additional context)
+        parts.extend(
+            _render_insight(insight, include_citations)
+            for insight in source.get("insights", [])
+        )
+
+    for note in context_data.get("notes", []):
+        id_suffix = f" [ID: {note.get('id', 'unknown')}]" if include_citations else ""
+        parts.append(
+            f"\n\n## Note: {note.get('title', 'Unknown')}{id_suffix}\n{note.get('content', '')}\n"
+        )
+
+    return "".join(parts)
+
+
+async def call_model_with_messages(state: ThreadState, config: RunnableConfig) -> dict:
+    # Use custom system prompt if provided, otherwise use default template
+    custom_prompt = state.get("custom_system_prompt")
+    include_citations = state.get("include_citations", True)
+
+    if custom_prompt:
+        context_str = _render_context(state.get("context"), bool(include_citations))
+
+        # Combine custom prompt with context
+        if context_str:
+            # Only add citing instructions if citations are enabled
+            citing_instructions = _CITING_INSTRUCTIONS if include_citations else ""
 
             system_prompt = f"""{custom_prompt}
 
-IMPORTANT: You must follow the role and behavior described above in your current response, regardless of what role you may have taken in previous messages.
+{_ROLE_REMINDER}
 
 # Context Information
 {context_str}
 {citing_instructions}"""
         else:
-            system_prompt = (
-                f"{custom_prompt}\n\nIMPORTANT: You must follow the role and behavior described above in your current response, regardless of what role you may have taken in previous messages."
-            )
+            system_prompt = f"{custom_prompt}\n\n{_ROLE_REMINDER}"
     else:
         # Use default chat template
         if include_citations:
             # Standard mode: use Prompter with full context including IDs
-            system_prompt = Prompter(prompt_template="chat/system").render(data=state)  # type: ignore[arg-type]
+            system_prompt = _CHAT_SYSTEM_PROMPTER.render(data=state)  # type: ignore[arg-type]
         else:
             # No-citation mode: build context without IDs and without citation instructions
-            context_str = ""
-            context_data = state.get("context", {})
-
-            # Add sources to context (without IDs)
-            if context_data and "sources" in context_data:
-                for source in context_data["sources"]:
-                    context_str += f"\n\n## Source: {source.get('title', 'Unknown')}\n"
-
-                    # Add full text content if available
-                    if "full_text" in source:
-                        context_str += (
-                            f"\n### Full Content\n{source.get('full_text', '')}\n"
-                        )
-
-                    # Add insights if available
-                    if "insights" in source:
-                        for insight in source["insights"]:
-                            insight_type = insight.get("insight_type", "Insight")
-                            context_str += (
-                                f"\n### {insight_type}\n{insight.get('content', '')}\n"
-                            )
-
-            # Add notes to context (without IDs)
-            if context_data and "notes" in context_data:
-                for note in context_data["notes"]:
-                    context_str += f"\n\n## Note: {note.get('title', 'Unknown')}\n{note.get('content', '')}\n"
+            context_str = _render_context(state.get("context"), False)
 
             # Build system prompt without citation instructions
             if context_str:
@@ -155,48 +129,21 @@ IMPORTANT: You must follow the role and behavior described above in your current
 
 Please provide your answers based on the context provided. Respond naturally without including document references or IDs."""
             else:
-                system_prompt = "You are a helpful AI assistant."
+                system_prompt = _NO_CITATIONS_DEFAULT_PROMPT
     payload = [SystemMessage(content=system_prompt)] + state.get("messages", [])
     model_id = config.get("configurable", {}).get("model_id") or state.get(
         "model_override"
     )
 
-    # Handle async model provisioning from sync context
-    def run_in_new_loop():
-        """Run the async function in a new event loop"""
-        new_loop = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(new_loop)
-            return new_loop.run_until_complete(
-                provision_langchain_model(
-                    str(payload), model_id, "chat", max_tokens=8192
-                )
-            )
-        finally:
-            new_loop.close()
-            asyncio.set_event_loop(None)
-
-    try:
-        # Try to get the current event loop
-        asyncio.get_running_loop()
-        # If we're in an event loop, run in a thread with a new loop
-        import concurrent.futures
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_in_new_loop)
-            model = future.result()
-    except RuntimeError:
-        # No event loop running, safe to use asyncio.run()
-        model = asyncio.run(
-            provision_langchain_model(
-                str(payload),
-                model_id,
-                "chat",
-                max_tokens=8192,
-            )
-        )
-
-    ai_message = model.invoke(payload)
+    # The provisioner only token-counts this text to spot large contexts;
+    # str(payload) would also stringify every message's metadata
+    payload_text = "\n".join(
+        m.content if isinstance(m.content, str) else str(m.content) for m in payload
+    )
+    model = await provision_langchain_model(
+        payload_text, model_id, "chat", max_tokens=8192
+    )
+    ai_message = await model.ainvoke(payload)
 
     # Clean thinking content from AI response (e.g., <think>...</think> tags)
     content = (
@@ -210,14 +157,32 @@ Please provide your answers based on the context provided. Respond naturally wit
     return {"messages": cleaned_message}
 
 
-conn = sqlite3.connect(
-    LANGGRAPH_CHECKPOINT_FILE,
-    check_same_thread=False,
-)
-memory = SqliteSaver(conn)
-
 agent_state = StateGraph(ThreadState)
 agent_state.add_node("agent", call_model_with_messages)
 agent_state.add_edge(START, "agent")
 agent_state.add_edge("agent", END)
-graph = agent_state.compile(checkpointer=memory)
+
+# WAL lets checkpoint reads run alongside a write, and synchronous=NORMAL is
+# crash-safe under WAL while skipping the fsync on every commit
+CHECKPOINT_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+"""
+
+
+async def connect_checkpoint_db() -> aiosqlite.Connection:
+    """Open the chat checkpoint database; called from the API lifespan."""
+    conn = await aiosqlite.connect(LANGGRAPH_CHECKPOINT_FILE)
+    await conn.executescript(CHECKPOINT_PRAGMAS)
+    return conn
+
+
+def compile_graph(conn: aiosqlite.Connection) -> CompiledStateGraph:
+    """Compile the chat graph over an open checkpoint connection.
+
+    The agent node is async, so the graph runs with ainvoke/astream and
+    needs the async SQLite checkpointer, which can only be built inside a
+    running event loop.
+    """
+    return agent_state.compile(checkpointer=AsyncSqliteSaver(conn))
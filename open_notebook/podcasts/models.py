@@ -1,11 +1,22 @@
 from typing import Any, ClassVar, Dict, List, Optional, Union
 
+from cachetools import TTLCache
 from pydantic import ConfigDict, Field, field_validator
 from surrealdb import RecordID
 
 from open_notebook.database.repository import ensure_record_id, repo_query
 from open_notebook.domain.base import ObjectModel
 
+# Episode profiles by name. Looked up for every podcast request but rarely
+# edited; cleared on save/delete in this process and expire after a minute,
+# so other processes (e.g. the worker) may see an edit up to a minute late.
+_episode_profile_cache: TTLCache = TTLCache(maxsize=128, ttl=60)
+
+
+def clear_episode_profile_cache() -> None:
+    """Drop cached profiles after writes that bypass save/delete."""
+    _episode_profile_cache.clear()
+
 
 class EpisodeProfile(ObjectModel):
     """
@@ -36,13 +47,26 @@ class EpisodeProfile(ObjectModel):
 
     @classmethod
     async def get_by_name(cls, name: str) -> Optional["EpisodeProfile"]:
-        """Get episode profile by name"""
-        result = await repo_query(
-            "SELECT * FROM episode_profile WHERE name = $name", {"name": name}
-        )
-        if result:
-            return cls(**result[0])
-        return None
+        """Get episode profile by name, cached briefly in-process"""
+        profile = _episode_profile_cache.get(name)
+        if profile is None:
+            result = await repo_query(
+                "SELECT * FROM episode_profile WHERE name = $name", {"name": name}
+            )
+            if not result:
+                return None
+            profile = cls(**result[0])
+            _episode_profile_cache[name] = profile
+        # Callers get their own copy so edits never leak into the cache
+        return profile.model_copy(deep=True)
+
+    async def save(self) -> None:
+        await super().save()
+        clear_episode_profile_cache()
+
+    async def delete(self) -> bool:
+        clear_episode_profile_cache()
+        return await super().delete()
 
 
 class SpeakerProfile(ObjectModel):
@@ -12,6 +12,8 @@ from typing import Tuple
 THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.DOTALL)
 # Pattern for malformed output: content</think> (missing opening tag)
 THINK_PATTERN_NO_OPEN = re.compile(r"^(.*?)</think>", re.DOTALL)
+# Runs of blank lines left behind once thinking blocks are removed
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n\s*\n")
 
 
 def remove_non_ascii(text: str) -> str:
@@ -81,7 +83,7 @@ def parse_thinking_content(content: str) -> Tuple[str, str]:
         cleaned_content = THINK_PATTERN.sub("", content)
 
         # Clean up extra whitespace
-        cleaned_content = re.sub(r"\n\s*\n\s*\n", "\n\n", cleaned_content).strip()
+        cleaned_content = BLANK_LINES_PATTERN.sub("\n\n", cleaned_content).strip()
 
         return thinking_content, cleaned_content
 
@@ -115,5 +117,17 @@ def clean_thinking_content(content: str) -> str:
         >>> clean_thinking_content(content)
         "Here's the answer"
     """
-    _, cleaned_content = parse_thinking_content(content)
-    return cleaned_content
+    # Same result as parse_thinking_content, without collecting the thinking
+    # text. Every AI message passes through here and most have no tags.
+    if not isinstance(content, str):
+        return str(content) if content is not None else ""
+    if len(content) > 100000 or "</think>" not in content:
+        return content
+
+    cleaned_content = THINK_PATTERN.sub("", content)
+    if cleaned_content != content:
+        return BLANK_LINES_PATTERN.sub("\n\n", cleaned_content).strip()
+
+    # Malformed output: content</think> (missing opening tag)
+    malformed_match = THINK_PATTERN_NO_OPEN.match(content)
+    return content[malformed_match.end() :].strip() if malformed_match else content
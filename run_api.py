@@ -28,4 +28,6 @@ if __name__ == "__main__":
         port=port,
         reload=reload,
         reload_dirs=[str(current_dir)] if reload else None,
+        # "auto" selects uvloop when installed (Linux/macOS), asyncio otherwise
+        loop="auto",
     )
@@ -0,0 +1,85 @@
+"""
+Unit tests for the password authentication middleware.
+
+These tests mount the middleware on a minimal Starlette app so they run
+without a database or any router dependencies.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from api.auth import PasswordAuthMiddleware
+
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+
+def _make_client(monkeypatch, password: str) -> TestClient:
+    monkeypatch.setenv("OPEN_NOTEBOOK_PASSWORD", password)
+    app = Starlette(
+        routes=[
+            Route("/health", _ok),
+            Route("/api/notebooks", _ok, methods=["GET", "OPTIONS"]),
+            Route("/public/{name}", _ok),
+        ]
+    )
+    app.add_middleware(
+        PasswordAuthMiddleware, excluded_paths=["/health", "/public/*"]
+    )
+    return TestClient(app)
+
+
+class TestPasswordAuthMiddleware:
+    """Test suite for PasswordAuthMiddleware."""
+
+    def test_no_password_allows_all(self, monkeypatch):
+        client = _make_client(monkeypatch, "")
+        assert client.get("/api/notebooks").status_code == 200
+
+    def test_excluded_path_skips_auth(self, monkeypatch):
+        client = _make_client(monkeypatch, "secret")
+        assert client.get("/health").status_code == 200
+
+    def test_excluded_prefix_skips_auth(self, monkeypatch):
+        client = _make_client(monkeypatch, "secret")
+        assert client.get("/public/anything").status_code == 200
+        assert client.get("/api/notebooks").status_code == 401
+
+    def test_options_skips_auth(self, monkeypatch):
+        client = _make_client(monkeypatch, "secret")
+        assert client.options("/api/notebooks").status_code == 200
+
+    @pytest.mark.parametrize(
+        "headers, detail",
+        [
+            ({}, "Missing authorization header"),
+            ({"Authorization": "secret"}, "Invalid authorization header format"),
+            ({"Authorization": "Basic secret"}, "Invalid authorization header format"),
+            ({"Authorization": "Bearer wrong"}, "Invalid password"),
+        ],
+    )
+    def test_rejected_requests(self, monkeypatch, headers, detail):
+        client = _make_client(monkeypatch, "secret")
+        response = client.get("/api/notebooks", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == detail
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_valid_password(self, monkeypatch):
+        client = _make_client(monkeypatch, "secret")
+        response = client.get(
+            "/api/notebooks", headers={"Authorization": "Bearer secret"}
+        )
+        assert response.status_code == 200
+        assert response.text == "ok"
+
+    def test_scheme_is_case_insensitive(self, monkeypatch):
+        client = _make_client(monkeypatch, "secret")
+        response = client.get(
+            "/api/notebooks", headers={"Authorization": "bearer secret"}
+        )
+        assert response.status_code == 200
@@ -0,0 +1,142 @@
+"""
+Unit tests for command job listing in api.command_service and its router.
+
+repo_query is mocked, so the keyset pagination is tested without a database.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.command_service import (
+    CommandService,
+    decode_job_cursor,
+    encode_job_cursor,
+)
+from open_notebook.exceptions import InvalidInputError
+
+CREATED = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def _row(n: int) -> dict:
+    return {
+        "id": f"command:job{n}",
+        "app": "open_notebook",
+        "name": "process_source",
+        "status": "completed",
+        "created": CREATED,
+        "updated": CREATED,
+    }
+
+
+@pytest.fixture(scope="module")
+def client():
+    from api.main import app
+
+    # Unhandled errors come back as 500 responses instead of being re-raised
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestJobCursor:
+    """Test suite for encode_job_cursor / decode_job_cursor."""
+
+    def test_round_trip(self):
+        cursor = encode_job_cursor(CREATED, "command:job1")
+        created, job_id = decode_job_cursor(cursor)
+
+        assert created == CREATED
+        assert str(job_id) == "command:job1"
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", ""])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(InvalidInputError, match="Invalid cursor"):
+            decode_job_cursor(cursor)
+
+
+class TestListCommandJobs:
+    """Test suite for CommandService.list_command_jobs."""
+
+    @pytest.mark.asyncio
+    async def test_first_page_binds_filters_and_returns_cursor(self):
+        with patch(
+            "api.command_service.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row(3), _row(2), _row(1)],
+        ) as mock_query:
+            jobs, next_cursor = await CommandService.list_command_jobs(
+                command_filter="process_source", status_filter="completed", limit=2
+            )
+
+        params = mock_query.call_args.args[1]
+        assert params == {
+            "app": None,
+            "name": "process_source",
+            "status": "completed",
+            "cursor_created": None,
+            "cursor_id": None,
+            "limit": 3,
+        }
+        assert [job["job_id"] for job in jobs] == ["command:job3", "command:job2"]
+        assert decode_job_cursor(next_cursor)[0] == CREATED
+        assert str(decode_job_cursor(next_cursor)[1]) == "command:job2"
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_bound_and_last_page_has_none(self):
+        cursor = encode_job_cursor(CREATED, "command:job2")
+        with patch(
+            "api.command_service.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row(1)],
+        ) as mock_query:
+            jobs, next_cursor = await CommandService.list_command_jobs(
+                limit=2, cursor=cursor
+            )
+
+        params = mock_query.call_args.args[1]
+        assert params["cursor_created"] == CREATED
+        assert str(params["cursor_id"]) == "command:job2"
+        assert [job["job_id"] for job in jobs] == ["command:job1"]
+        assert next_cursor is None
+
+
+class TestListCommandJobsEndpoint:
+    """Test suite for GET /api/commands/jobs."""
+
+    def test_response_shape(self, client):
+        with patch(
+            "api.command_service.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row(1)],
+        ):
+            response = client.get("/api/commands/jobs")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["next_cursor"] is None
+        assert body["jobs"][0]["job_id"] == "command:job1"
+
+    def test_malformed_cursor_returns_400(self, client):
+        with patch(
+            "api.command_service.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            response = client.get("/api/commands/jobs", params={"cursor": "garbage"})
+
+        assert response.status_code == 400
+        assert "Invalid cursor" in response.json()["detail"]
+        mock_query.assert_not_called()
+
+    def test_other_value_errors_are_not_reported_as_bad_cursor(self, client):
+        with patch(
+            "api.command_service.repo_query",
+            new_callable=AsyncMock,
+            side_effect=ValueError("boom"),
+        ):
+            response = client.get("/api/commands/jobs")
+
+        assert response.status_code == 500
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,39 @@
+"""
+Unit tests for the CORS headers added to error responses in api.main.
+"""
+
+import pytest
+from starlette.requests import Request
+
+import api.main as api_main
+
+
+def _request(origin=None) -> Request:
+    headers = [(b"origin", origin.encode())] if origin else []
+    return Request({"type": "http", "headers": headers})
+
+
+class TestCorsErrorHeaders:
+    """Test suite for _cors_error_headers."""
+
+    def test_allowed_origin_is_echoed(self, monkeypatch):
+        monkeypatch.setattr(api_main, "CORS_ORIGINS", ["https://app.example"])
+        headers = api_main._cors_error_headers(_request("https://app.example"))
+        assert headers["Access-Control-Allow-Origin"] == "https://app.example"
+
+    def test_unlisted_origin_gets_no_cors_headers(self, monkeypatch):
+        monkeypatch.setattr(api_main, "CORS_ORIGINS", ["https://app.example"])
+        assert api_main._cors_error_headers(_request("https://evil.example")) == {}
+
+    def test_wildcard_echoes_any_origin(self, monkeypatch):
+        monkeypatch.setattr(api_main, "CORS_ORIGINS", ["*"])
+        headers = api_main._cors_error_headers(_request("https://other.example"))
+        assert headers["Access-Control-Allow-Origin"] == "https://other.example"
+
+    def test_no_origin_header(self, monkeypatch):
+        monkeypatch.setattr(api_main, "CORS_ORIGINS", ["*"])
+        assert api_main._cors_error_headers(_request()) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,6 +6,7 @@ that can be tested without database mocking.
 """
 
 import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
@@ -15,9 +16,16 @@ from pydantic import ValidationError
 from open_notebook.ai.models import ModelManager
 from open_notebook.domain.base import RecordModel
 from open_notebook.domain.content_settings import ContentSettings
-from open_notebook.domain.notebook import Asset, Note, Notebook, Source
+from open_notebook.domain.notebook import (
+    Asset,
+    ChatSession,
+    Note,
+    Notebook,
+    Source,
+    SystemPrompt,
+)
 from open_notebook.domain.transformation import Transformation
-from open_notebook.exceptions import InvalidInputError
+from open_notebook.exceptions import InvalidInputError, NotFoundError
 from open_notebook.podcasts.models import EpisodeProfile, SpeakerProfile
 
 # ============================================================================
@@ -332,6 +340,31 @@ class TestTransformationDomain:
         assert transform.name == "summarize"
         assert transform.apply_default is True
 
+    @pytest.mark.asyncio
+    async def test_iso_timestamps_refresh_after_save(self):
+        """Test cached ISO timestamps are recomputed once save() updates them."""
+        transform = Transformation(
+            name="summarize",
+            title="Summarize Content",
+            description="Creates a summary",
+            prompt="Summarize the following text: {content}",
+            apply_default=True,
+        )
+        assert transform.created_iso == ""
+
+        saved = {
+            "id": "transformation:1",
+            "created": datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+            "updated": datetime(2025, 1, 2, 10, tzinfo=timezone.utc),
+        }
+        with patch(
+            "open_notebook.domain.base.repo_create", AsyncMock(return_value=[saved])
+        ):
+            await transform.save()
+
+        assert transform.created_iso == "2025-01-01T10:00:00+00:00"
+        assert transform.updated_iso == "2025-01-02T10:00:00+00:00"
+
 
 # ============================================================================
 # TEST SUITE 8: Content Settings
@@ -405,6 +438,329 @@ class TestEpisodeProfile:
         )
         assert profile.num_segments == 5
 
+    @pytest.mark.asyncio
+    async def test_get_by_name_is_cached_until_save(self):
+        """Test that a profile is fetched once and refreshed after save."""
+        row = {
+            "id": "episode_profile:cached",
+            "name": "Cached",
+            "speaker_config": "default",
+            "outline_provider": "openai",
+            "outline_model": "gpt-4",
+            "transcript_provider": "openai",
+            "transcript_model": "gpt-4",
+            "default_briefing": "Test briefing",
+        }
+
+        with patch(
+            "open_notebook.podcasts.models.repo_query", new_callable=AsyncMock
+        ) as mock_query, patch.object(
+            EpisodeProfile.__bases__[0], "save", new_callable=AsyncMock
+        ):
+            mock_query.return_value = [row]
+
+            profile = await EpisodeProfile.get_by_name("Cached")
+            profile.num_segments = 10
+            assert (await EpisodeProfile.get_by_name("Cached")).num_segments == 5
+            mock_query.assert_called_once()
+
+            await profile.save()
+            await EpisodeProfile.get_by_name("Cached")
+            assert mock_query.call_count == 2
+
+
+# ============================================================================
+# TEST SUITE 10: System Prompt Content Cache
+# ============================================================================
+
+
+class TestSystemPromptCache:
+    """Test suite for SystemPrompt.get_content caching."""
+
+    @pytest.mark.asyncio
+    async def test_get_content_is_cached_until_save(self):
+        """Test that content is fetched once and refreshed after save."""
+        prompt = SystemPrompt(id="system_prompt:cached", name="P", content="v1")
+
+        with patch.object(
+            SystemPrompt, "get", new_callable=AsyncMock
+        ) as mock_get, patch.object(
+            SystemPrompt.__bases__[0], "save", new_callable=AsyncMock
+        ):
+            mock_get.return_value = prompt
+
+            assert await SystemPrompt.get_content(prompt.id) == "v1"
+            assert await SystemPrompt.get_content(prompt.id) == "v1"
+            mock_get.assert_called_once()
+
+            prompt.content = "v2"
+            await prompt.save()
+            assert await SystemPrompt.get_content(prompt.id) == "v2"
+            assert mock_get.call_count == 2
+
+
+# ============================================================================
+# TEST SUITE 11: Batch Fetch
+# ============================================================================
+
+
+class TestGetMany:
+    """Test suite for ObjectModel.get_many."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_keeps_order_and_skips_missing(self):
+        """Test that records come back in request order without missing IDs."""
+        rows = [
+            {"id": "note:b", "title": "B", "content": "b"},
+            {"id": "note:a", "title": "A", "content": "a"},
+        ]
+        with patch(
+            "open_notebook.domain.base.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            mock_query.return_value = rows
+            notes = await Note.get_many(["note:a", "note:missing", "note:b"])
+
+        mock_query.assert_called_once()
+        assert [note.id for note in notes] == ["note:a", "note:b"]
+
+    @pytest.mark.asyncio
+    async def test_get_many_empty(self):
+        """Test that no query is issued for an empty ID list."""
+        with patch(
+            "open_notebook.domain.base.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            assert await Note.get_many([]) == []
+            mock_query.assert_not_called()
+
+
+# ============================================================================
+# TEST SUITE 12: Chat Session Touch
+# ============================================================================
+
+
+class TestChatSessionTouch:
+    """Test suite for ChatSession.touch."""
+
+    @pytest.mark.asyncio
+    async def test_touch_only_updates_timestamp(self):
+        """Test that touch issues a single timestamp-only UPDATE."""
+        session = ChatSession(id="chat_session:abc", title="Chat")
+        with patch(
+            "open_notebook.domain.notebook.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            await session.touch()
+
+        mock_query.assert_called_once()
+        query, params = mock_query.call_args.args
+        assert query == "UPDATE $id SET updated = time::now()"
+        assert str(params["id"]) == "chat_session:abc"
+
+
+# ============================================================================
+# TEST SUITE 13: Notes By Notebook
+# ============================================================================
+
+
+class TestNoteGetForNotebook:
+    """Test suite for Note.get_for_notebook."""
+
+    @pytest.mark.asyncio
+    async def test_returns_notes_from_single_query(self):
+        """Test that rows from the single query become notes."""
+        rows = [{"note": {"id": "note:1", "title": "First", "note_type": "human"}}]
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=rows,
+        ) as mock_query:
+            notes = await Note.get_for_notebook("notebook:abc")
+
+        mock_query.assert_called_once()
+        assert [note.title for note in notes] == ["First"]
+        assert str(mock_query.call_args.args[1]["id"]) == "notebook:abc"
+
+    @pytest.mark.asyncio
+    async def test_empty_notebook(self):
+        """Test that an existing notebook without notes yields an empty list."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=[],
+        ):
+            assert await Note.get_for_notebook("notebook:abc") == []
+
+    @pytest.mark.asyncio
+    async def test_missing_notebook_raises(self):
+        """Test that a missing notebook raises NotFoundError."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            with pytest.raises(NotFoundError):
+                await Note.get_for_notebook("notebook:missing")
+
+
+# ============================================================================
+# TEST SUITE 14: Notebook Prompts By ID
+# ============================================================================
+
+
+class TestNotebookPromptsById:
+    """Test suite for the single-query notebook prompt helpers."""
+
+    @pytest.mark.asyncio
+    async def test_get_prompts_by_id(self):
+        """Test that prompt rows become SystemPrompt objects."""
+        rows = [{"prompt": {"id": "system_prompt:1", "name": "A", "content": "x"}}]
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=rows,
+        ):
+            prompts = await Notebook.get_prompts_by_id("notebook:abc")
+
+        assert [prompt.name for prompt in prompts] == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_get_prompts_by_id_missing_notebook(self):
+        """Test that a missing notebook raises NotFoundError."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            with pytest.raises(NotFoundError):
+                await Notebook.get_prompts_by_id("notebook:missing")
+
+    @pytest.mark.asyncio
+    async def test_set_active_prompt_by_id(self):
+        """Test that the stored prompt ID is returned from one UPDATE."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=["system_prompt:1"],
+        ) as mock_query:
+            result = await Notebook.set_active_prompt_by_id(
+                "notebook:abc", "system_prompt:1"
+            )
+
+        mock_query.assert_called_once()
+        params = mock_query.call_args.args[1]
+        assert str(params["id"]) == "notebook:abc"
+        assert params["prompt_id"] == "system_prompt:1"
+        assert result == "system_prompt:1"
+
+    @pytest.mark.asyncio
+    async def test_set_active_prompt_by_id_missing_notebook(self):
+        """Test that updating a missing notebook raises NotFoundError."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            return_value=[],
+        ):
+            with pytest.raises(NotFoundError):
+                await Notebook.set_active_prompt_by_id("notebook:missing", None)
+
+
+# ============================================================================
+# TEST SUITE 15: Notebook Existence Check
+# ============================================================================
+
+
+class TestNotebookExists:
+    """Test suite for Notebook.exists."""
+
+    @pytest.mark.asyncio
+    async def test_checks_database_every_time(self):
+        """Test that existence is not remembered across calls."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query",
+            new_callable=AsyncMock,
+            side_effect=[["notebook:abc"], []],
+        ) as mock_query:
+            assert await Notebook.exists("notebook:abc") is True
+            assert await Notebook.exists("notebook:abc") is False
+
+        assert mock_query.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_tables_do_not_exist(self):
+        """Test that a record from another table is not a notebook."""
+        with patch(
+            "open_notebook.domain.notebook.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            assert await Notebook.exists("source:abc") is False
+
+        mock_query.assert_not_called()
+
+
+# ============================================================================
+# TEST SUITE 16: Transformation Single-Statement Writes
+# ============================================================================
+
+
+class TestTransformationByIdWrites:
+    """Test suite for Transformation.update_by_id and delete_by_id."""
+
+    @pytest.mark.asyncio
+    async def test_update_by_id_returns_updated_record(self):
+        """Test that the merged record comes back as a Transformation."""
+        row = {
+            "id": "transformation:abc",
+            "name": "summarize",
+            "title": "Short Summary",
+            "description": "Creates a summary",
+            "prompt": "Summarize",
+            "apply_default": False,
+        }
+        with patch(
+            "open_notebook.domain.transformation.repo_query",
+            new_callable=AsyncMock,
+            return_value=[row],
+        ) as mock_query:
+            result = await Transformation.update_by_id(
+                "transformation:abc", {"title": "Short Summary"}
+            )
+
+        params = mock_query.call_args.args[1]
+        assert str(params["id"]) == "transformation:abc"
+        assert params["data"] == {"title": "Short Summary"}
+        assert result is not None
+        assert result.title == "Short Summary"
+
+    @pytest.mark.asyncio
+    async def test_update_by_id_missing_record(self):
+        """Test that updating a missing transformation returns None."""
+        with patch(
+            "open_notebook.domain.transformation.repo_query",
+            new_callable=AsyncMock,
+            return_value=[],
+        ):
+            assert await Transformation.update_by_id("transformation:x", {}) is None
+
+    @pytest.mark.asyncio
+    async def test_delete_by_id(self):
+        """Test that delete reports whether a record was removed."""
+        with patch(
+            "open_notebook.domain.transformation.repo_query",
+            new_callable=AsyncMock,
+            side_effect=[[{"id": "transformation:abc"}], []],
+        ):
+            assert await Transformation.delete_by_id("transformation:abc") is True
+            assert await Transformation.delete_by_id("transformation:abc") is False
+
+    @pytest.mark.asyncio
+    async def test_other_tables_are_not_touched(self):
+        """Test that IDs from other tables are treated as missing."""
+        with patch(
+            "open_notebook.domain.transformation.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            assert await Transformation.delete_by_id("notebook:abc") is False
+            assert await Transformation.update_by_id("notebook:abc", {}) is None
+
+        mock_query.assert_not_called()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -6,9 +6,18 @@ without heavy mocking of the actual processing logic.
 """
 
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from esperanto import LanguageModel
 
+from open_notebook.ai.models import (
+    DefaultModels,
+    Model,
+    clear_provision_cache,
+    provisioned_clients,
+)
+from open_notebook.ai.provision import provision_langchain_model
 from open_notebook.graphs.prompt import PatternChainState, graph
 from open_notebook.graphs.tools import get_current_timestamp
 from open_notebook.graphs.transformation import (
@@ -151,5 +160,90 @@ class TestTransformationGraph:
         assert hasattr(transformation_graph, "ainvoke")
 
 
+# ============================================================================
+# TEST SUITE 4: Model Provisioning Cache
+# ============================================================================
+
+
+class TestProvisionCache:
+    """Test suite for the provisioned LangChain client cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        clear_provision_cache()
+        with patch("open_notebook.ai.provision.token_count", return_value=10):
+            yield
+        clear_provision_cache()
+
+    def _language_model(self):
+        model = MagicMock(spec=LanguageModel)
+        model.to_langchain.side_effect = lambda: object()
+        return model
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_for_same_selection(self):
+        with patch(
+            "open_notebook.ai.provision.model_manager.get_model",
+            new=AsyncMock(return_value=self._language_model()),
+        ) as get_model:
+            first = await provision_langchain_model(
+                "a", "model:x", "chat", max_tokens=10
+            )
+            second = await provision_langchain_model(
+                "b", "model:x", "chat", max_tokens=10
+            )
+            other = await provision_langchain_model(
+                "c", "model:x", "chat", max_tokens=20
+            )
+
+        assert first is second
+        assert other is not first
+        assert get_model.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_large_content_bypasses_cached_selection(self):
+        with (
+            patch(
+                "open_notebook.ai.provision.model_manager.get_model",
+                new=AsyncMock(return_value=self._language_model()),
+            ),
+            patch(
+                "open_notebook.ai.provision.model_manager.get_default_model",
+                new=AsyncMock(return_value=self._language_model()),
+            ) as get_default,
+            patch("open_notebook.ai.provision.token_count", side_effect=[10, 200_000]),
+        ):
+            small = await provision_langchain_model("a", "model:x", "chat")
+            large = await provision_langchain_model("b", "model:x", "chat")
+
+        assert small is not large
+        get_default.assert_awaited_once_with("large_context")
+
+    @pytest.mark.asyncio
+    async def test_clear_forces_reprovision(self):
+        with patch(
+            "open_notebook.ai.provision.model_manager.get_model",
+            new=AsyncMock(return_value=self._language_model()),
+        ):
+            first = await provision_langchain_model("a", "model:x", "chat")
+            clear_provision_cache()
+            second = await provision_langchain_model("a", "model:x", "chat")
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_model_and_default_writes_clear_cache(self):
+        model = Model(name="gpt-4", provider="openai", type="language")
+        with (
+            patch("open_notebook.ai.models.ObjectModel.save", new=AsyncMock()),
+            patch("open_notebook.ai.models.ObjectModel.delete", new=AsyncMock()),
+            patch("open_notebook.ai.models.RecordModel.update", new=AsyncMock()),
+        ):
+            for write in (model.save, model.delete, DefaultModels().update):
+                provisioned_clients["key"] = object()
+                await write()
+                assert "key" not in provisioned_clients
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
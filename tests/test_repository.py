@@ -0,0 +1,80 @@
+"""
+Unit tests for the open_notebook.database.repository connection pool.
+
+Connections are replaced with in-memory fakes, so no SurrealDB server is needed.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from open_notebook.database.repository import (
+    close_db_pool,
+    init_db_pool,
+    repo_query,
+)
+
+
+class _FakeConnection:
+    """Mimics AsyncSurreal's binding to the loop that opened it."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+
+    async def query(self, query_str, vars=None):
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Future attached to a different loop")
+        return [{"ok": True}]
+
+    async def close(self):
+        self.closed = True
+
+
+class TestConnectionPoolLoopAffinity:
+    """Test suite for using the pool from the loop it was created on only."""
+
+    @pytest.fixture
+    def opened(self):
+        connections = []
+
+        async def fake_open():
+            connection = _FakeConnection()
+            connections.append(connection)
+            return connection
+
+        with patch("open_notebook.database.repository._open_connection", new=fake_open):
+            yield connections
+
+    @pytest.mark.asyncio
+    async def test_pool_reused_on_owning_loop(self, opened):
+        """Test that queries on the pool's loop reuse the warmed connection."""
+        pool = await init_db_pool(max_size=2, min_size=1)
+        try:
+            assert await repo_query("SELECT 1") == [{"ok": True}]
+            assert await repo_query("SELECT 1") == [{"ok": True}]
+            assert len(opened) == 1
+            assert len(pool._idle) == 1
+        finally:
+            await close_db_pool()
+
+    @pytest.mark.asyncio
+    async def test_other_loop_gets_one_off_connection(self, opened):
+        """Test that asyncio.run in a worker thread never touches pooled connections."""
+        pool = await init_db_pool(max_size=2, min_size=1)
+        try:
+            warmed = opened[0]
+            result = await asyncio.to_thread(asyncio.run, repo_query("SELECT 1"))
+
+            assert result == [{"ok": True}]
+            assert len(opened) == 2
+            assert opened[1].closed
+            assert [db for db, _ in pool._idle] == [warmed]
+            assert await repo_query("SELECT 1") == [{"ok": True}]
+        finally:
+            await close_db_pool()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+"""
+Unit tests for the transformations router in api.routers.transformations.
+
+repo_query is mocked, so the keyset pagination is tested without a database.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.routers.transformations import (
+    _xform_cache,
+    _xform_cache_key,
+    decode_transformation_cursor,
+    encode_transformation_cursor,
+)
+from open_notebook.exceptions import InvalidInputError
+
+
+def _row(name: str) -> dict:
+    return {
+        "id": f"transformation:{name}",
+        "name": name,
+        "title": name.title(),
+        "description": "",
+        "prompt": "Summarize",
+        "apply_default": False,
+        "created": "2025-01-01T00:00:00Z",
+        "updated": "2025-01-01T00:00:00Z",
+    }
+
+
+@pytest.fixture(scope="module")
+def client():
+    from api.main import app
+
+    return TestClient(app)
+
+
+class TestTransformationCursor:
+    """Test suite for encode/decode_transformation_cursor."""
+
+    def test_round_trip_with_separator_in_name(self):
+        cursor = encode_transformation_cursor("a|b", "transformation:ab")
+        name, transformation_id = decode_transformation_cursor(cursor)
+
+        assert name == "a|b"
+        assert str(transformation_id) == "transformation:ab"
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", ""])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(InvalidInputError, match="Invalid cursor"):
+            decode_transformation_cursor(cursor)
+
+
+class TestGetTransformations:
+    """Test suite for GET /api/transformations."""
+
+    def test_unpaged_returns_every_row(self, client):
+        with patch(
+            "api.routers.transformations.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row("a"), _row("b")],
+        ) as mock_query:
+            response = client.get("/api/transformations")
+
+        assert response.status_code == 200
+        assert [row["name"] for row in response.json()] == ["a", "b"]
+        assert "x-next-cursor" not in response.headers
+        assert "LIMIT" not in mock_query.call_args.args[0]
+
+    def test_first_page_sets_next_cursor(self, client):
+        with patch(
+            "api.routers.transformations.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row("a"), _row("b"), _row("c")],
+        ) as mock_query:
+            response = client.get("/api/transformations", params={"limit": 2})
+
+        params = mock_query.call_args.args[1]
+        assert params == {"cursor_name": None, "cursor_id": None, "limit": 3}
+        assert [row["name"] for row in response.json()] == ["a", "b"]
+        name, transformation_id = decode_transformation_cursor(
+            response.headers["x-next-cursor"]
+        )
+        assert name == "b"
+        assert str(transformation_id) == "transformation:b"
+
+    def test_cursor_is_bound_and_last_page_has_no_cursor(self, client):
+        cursor = encode_transformation_cursor("b", "transformation:b")
+        with patch(
+            "api.routers.transformations.repo_query",
+            new_callable=AsyncMock,
+            return_value=[_row("c")],
+        ) as mock_query:
+            response = client.get(
+                "/api/transformations", params={"limit": 2, "cursor": cursor}
+            )
+
+        params = mock_query.call_args.args[1]
+        assert params["cursor_name"] == "b"
+        assert str(params["cursor_id"]) == "transformation:b"
+        assert [row["name"] for row in response.json()] == ["c"]
+        assert "x-next-cursor" not in response.headers
+
+    def test_malformed_cursor_returns_400(self, client):
+        with patch(
+            "api.routers.transformations.repo_query", new_callable=AsyncMock
+        ) as mock_query:
+            response = client.get(
+                "/api/transformations", params={"cursor": "garbage"}
+            )
+
+        assert response.status_code == 400
+        assert "Invalid cursor" in response.json()["detail"]
+        mock_query.assert_not_called()
+
+
+class TestTransformationCache:
+    """Test suite for the execute-path transformation cache."""
+
+    def test_delete_evicts_the_canonical_key(self, client):
+        _xform_cache[_xform_cache_key("transformation:a")] = object()
+        with patch(
+            "open_notebook.domain.transformation.Transformation.delete_by_id",
+            new_callable=AsyncMock,
+            return_value=True,
+        ):
+            response = client.delete("/api/transformations/transformation:a")
+
+        assert response.status_code == 200
+        assert _xform_cache_key("transformation:a") not in _xform_cache
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
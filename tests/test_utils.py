@@ -126,6 +126,21 @@ class TestTextUtilities:
         assert "Public response" in result
         assert "Internal thoughts" not in result
 
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "Plain answer without tags",
+            "<think>a</think>\n\n\n\nAnswer <think>b</think> done  ",
+            "Reasoning without opening tag</think>\nAnswer",
+            "<think></think>Empty thinking",
+            None,
+            42,
+        ],
+    )
+    def test_clean_thinking_content_matches_parse(self, content):
+        """Test the fast path agrees with parse_thinking_content."""
+        assert clean_thinking_content(content) == parse_thinking_content(content)[1]
+
 
 # ============================================================================
 # TEST SUITE 2: Token Utilities